@@ -1,22 +1,41 @@
 import asyncio
+import threading
 import numpy as np
 import sounddevice as sd
 from .config import AUDIO_SAMPLE_RATE, AUDIO_DURATION_SECONDS
 
+# One input stream per sample rate, kept open between recordings. Starting and stopping an
+# open stream is much cheaper than sd.rec opening and closing a PortAudio stream every turn.
+_input_streams: dict[int, sd.InputStream] = {}
+# A second wake word can start a second interaction while one is still recording; the streams
+# are shared, so one start/read/stop cycle runs at a time.
+_record_lock = threading.Lock()
+
+def _get_input_stream(sample_rate: int) -> sd.InputStream:
+    stream = _input_streams.get(sample_rate)
+    if stream is None or stream.closed:
+        stream = sd.InputStream(samplerate=sample_rate, channels=1, dtype="int16")
+        _input_streams[sample_rate] = stream
+    return stream
+
+def _record_blocking(sample_rate: int, duration: float) -> np.ndarray:
+    with _record_lock:
+        stream = _get_input_stream(sample_rate)
+        stream.start()  # Capture starts fresh here; nothing from before the call is buffered
+        try:
+            recording, _overflowed = stream.read(int(duration * sample_rate))
+        finally:
+            stream.stop()
+    return recording.ravel()  # (frames, 1) is contiguous, so this is a view, not a copy
+
 async def record_audio_async(sample_rate=AUDIO_SAMPLE_RATE, duration=AUDIO_DURATION_SECONDS) -> np.ndarray:
     print("Recording (async)...")
-    recording_data = await asyncio.to_thread(
-        sd.rec, int(duration * sample_rate), samplerate=sample_rate, channels=1, dtype="int16"
-    )
-    await asyncio.to_thread(sd.wait)
+    recording_data = await asyncio.to_thread(_record_blocking, sample_rate, duration)
     print("Recording complete (async).")
-    return recording_data.flatten()
+    return recording_data
 
 def record_audio(sample_rate=AUDIO_SAMPLE_RATE, duration=AUDIO_DURATION_SECONDS) -> np.ndarray:
     print("Recording...")
-    recording = sd.rec(
-        int(duration * sample_rate), samplerate=sample_rate, channels=1, dtype="int16"
-    )
-    sd.wait()
+    recording = _record_blocking(sample_rate, duration)
     print("Recording complete.")
-    return recording.flatten()
\ No newline at end of file
+    return recording
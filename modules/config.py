@@ -1,5 +1,4 @@
 import os
-import torch
 
 # _SCRIPT_DIR should point to the project's root directory (e.g., 'e:\SCRIPTS\voice_assistant')
 # This assumes config.py is in a 'modules' subdirectory.
@@ -13,8 +12,54 @@ PICOVOICE_KEY_FILE_PATH = os.path.join(
     BASE_DIR, "picovoice_key.txt"
 )  # Renamed for clarity
 OPENWEATHER_API_KEY_FILE_PATH = os.path.join(BASE_DIR, "openweather_api_key.txt")
+WEATHER_CACHE_PATH = os.path.join(BASE_DIR, "weather_cache.json")
+
+# Device settings need torch, which takes seconds to import and isn't installed yet when
+# setup_assistant.py first runs. They are resolved on first access (see __getattr__ below),
+# so modules that only need paths or keys (setup, DB, weather) never import torch.
+_DEVICE_SETTINGS = frozenset({
+    "ASR_DEVICE",
+    "STT_CUDA_DEVICE",
+    "TTS_CUDA_DEVICE",
+    "ALIGN_DEVICE",
+    "TTS_DEVICE",
+    "STT_COMPUTE_TYPE",
+    "STT_BATCH_SIZE",
+})
+
+
+def _resolve_device_settings():
+    import torch
+
+    cuda_available = torch.cuda.is_available()
+    asr_device = "cuda" if cuda_available else "cpu"
+    # On multi-GPU hosts STT and TTS can be pinned to different cards so they don't contend
+    # for the same SMs and allocator. Indices past the last GPU fall back to the last one.
+    max_cuda_index = max(torch.cuda.device_count() - 1, 0)
+    stt_cuda_device = min(int(os.environ.get("STT_CUDA_DEVICE", "0")), max_cuda_index)
+    tts_cuda_device = min(int(os.environ.get("TTS_CUDA_DEVICE", "0")), max_cuda_index)
+    globals().update(
+        ASR_DEVICE=asr_device,
+        STT_CUDA_DEVICE=stt_cuda_device,
+        TTS_CUDA_DEVICE=tts_cuda_device,
+        ALIGN_DEVICE=f"cuda:{stt_cuda_device}" if asr_device == "cuda" else "cpu",
+        TTS_DEVICE=f"cuda:{tts_cuda_device}" if cuda_available else "cpu",
+        # Quantized CTranslate2 kernels: int8 weights with fp16 activations on GPU, plain int8 on CPU.
+        # STT_COMPUTE_TYPE in the environment overrides this (e.g. "float16" to trade speed for accuracy).
+        STT_COMPUTE_TYPE=os.environ.get("STT_COMPUTE_TYPE") or ("int8_float16" if asr_device == "cuda" else "int8"),
+        # WhisperX batches VAD segments through the encoder; GPUs take wide batches,
+        # while large CPU batches just contend for cores
+        STT_BATCH_SIZE=int(os.environ.get("STT_BATCH_SIZE", "16" if asr_device == "cuda" else "4")),
+    )
+
+
+def __getattr__(name):
+    if name in _DEVICE_SETTINGS:
+        _resolve_device_settings()  # Stores them as real globals, so this runs only once
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-ASR_DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
 ALIGN_LANGUAGE_CODE = "en"  # For WhisperX alignment model
 
 GREETING_MESSAGE = "How can I help you?"
@@ -22,11 +67,33 @@ GREETING_MESSAGE = "How can I help you?"
 # TTS Model
 TTS_MODEL_NAME = "tts_models/en/ljspeech/vits"
 TTS_SAMPLERATE = 22050
+TTS_CACHE_SIZE = 256  # Number of synthesized phrases kept in memory
+TTS_CACHE_MAX_CHARS = 120  # Only phrases up to this length are cached; longer ones rarely repeat
+# Serve the VITS model through ONNX Runtime instead of PyTorch (requires onnxruntime).
+# The model is exported on first start; on CPU the export is also int8-quantized.
+TTS_USE_ONNX = os.environ.get("TTS_USE_ONNX", "0") == "1"
+# Exported artifacts are named after the model, so changing TTS_MODEL_NAME never loads a stale file
+_TTS_MODEL_SLUG = TTS_MODEL_NAME.replace("/", "--")
+TTS_ONNX_PATH = os.path.join(BASE_DIR, f"{_TTS_MODEL_SLUG}.onnx")
+# torch.compile the VITS waveform decoder at startup (adds tens of seconds to initialization)
+TTS_COMPILE = os.environ.get("TTS_COMPILE", "0") == "1"
+# Half-precision autocast for PyTorch synthesis on CUDA: "float32" (off), "float16" or "bfloat16"
+TTS_DTYPE = os.environ.get("TTS_DTYPE", "float32")
+# On CPU, trace the VITS waveform decoder to an optimized TorchScript module (cached after the first run)
+TTS_SCRIPT_VOCODER = os.environ.get("TTS_SCRIPT_VOCODER", "0") == "1"
+TTS_VOCODER_SCRIPT_PATH = os.path.join(BASE_DIR, f"{_TTS_MODEL_SLUG}.decoder.pt")
 
 # STT Model
-STT_MODEL_NAME = "base.en" # or "base" if multilingual needed and handled
-STT_COMPUTE_TYPE = "int8"
-STT_BATCH_SIZE = 16
+# "base.en" is the lightest default. For better accuracy at lower cost than the full-size
+# checkpoints, the CTranslate2 distil-whisper models ("distil-small.en", "distil-medium.en",
+# "distil-large-v3") load through WhisperX unchanged. Use "base" if multilingual is needed and handled.
+STT_MODEL_NAME = os.environ.get("STT_MODEL_NAME", "base.en")
+# Trailing silence is trimmed before transcription so encoding scales with speech length
+STT_HUSH_THRESHOLD = 0.01  # Frame RMS (float audio in [-1, 1]) below which a frame counts as silence
+STT_MIN_SILENCE_MS = 300  # Silence kept after the last voiced frame
+# Word-level alignment only matters to callers that use word timestamps; transcribe_audio*
+# return plain text, so the alignment model is neither loaded nor run unless this is enabled.
+STT_WORD_TIMESTAMPS = os.environ.get("STT_WORD_TIMESTAMPS", "0") == "1"
 
 # Audio Recording
 AUDIO_SAMPLE_RATE = 16000
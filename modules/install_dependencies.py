@@ -225,6 +225,7 @@ def install_python_dependencies():
             "accelerate==1.0.0",
             "sounddevice",
             "aiohttp",
+            "orjson",
         ],
         "Failed to install core dependencies",
     )
@@ -13,13 +13,7 @@ import platform
 import subprocess
 import threading
 import time as _time
-
-# Default config path for all modules
-CONFIG_PATH = os.path.join("modules", "configs", "systems_config.json")
-
-# Module-level cache for device configurations
-_DEVICES_CACHE: Optional[Dict[str, Any]] = None
-_CACHED_CONFIG_PATH: Optional[str] = None
+from modules.wol import CONFIG_PATH, clear_systems_config_cache, load_systems_config
 
 # Constant for keys that have special handling in announcements
 _ANNOUNCE_DEVICE_PRIMARY_KEYS = ("mac_address", "ip_address", "group", "type", "aliases")
@@ -27,37 +21,14 @@ _ANNOUNCE_DEVICE_PRIMARY_KEYS = ("mac_address", "ip_address", "group", "type", "
 
 def load_devices(config_path: str = CONFIG_PATH) -> Dict[str, Any]:
     """
-    Loads devices from the systems configuration JSON file, using a cache.
+    Loads devices from the systems configuration JSON file, using the shared mtime-checked cache in wol.
     Returns an empty dict and provides TTS/log feedback on error.
     """
-    global _DEVICES_CACHE, _CACHED_CONFIG_PATH
-
-    if _DEVICES_CACHE is not None and _CACHED_CONFIG_PATH == config_path:
-        return _DEVICES_CACHE.copy()  # Return a copy to prevent external modification
-
-    try:
-        # Ensure the directory exists before trying to open the file for reading
-        config_dir = os.path.dirname(config_path)
-        if config_dir: # Check if config_dir is not an empty string (e.g. if config_path is just a filename)
-            os.makedirs(config_dir, exist_ok=True)
-
-        with open(config_path, "r") as file:
-            devices = json.load(file)
-        _DEVICES_CACHE = devices
-        _CACHED_CONFIG_PATH = config_path
-        return devices
-    except FileNotFoundError:
-        logging.error(f"Device config not found at: {config_path}")
-        speak(f"Device config not found at: {config_path}")
-        _DEVICES_CACHE = {} # Initialize cache to empty
-        _CACHED_CONFIG_PATH = config_path
-        return {}
-    except json.JSONDecodeError:
-        logging.error(f"Invalid JSON in device config: {config_path}")
-        speak(f"Invalid JSON in device config: {config_path}")
-        _DEVICES_CACHE = {} # Initialize cache to empty
-        _CACHED_CONFIG_PATH = config_path
-        return {}
+    # Ensure the directory exists before trying to open the file for reading
+    config_dir = os.path.dirname(config_path)
+    if config_dir: # Check if config_dir is not an empty string (e.g. if config_path is just a filename)
+        os.makedirs(config_dir, exist_ok=True)
+    return load_systems_config(config_path).copy()  # Return a copy to prevent external modification of the cache
 
 
 def get_device(name: str) -> Optional[Dict[str, Any]]:
@@ -82,8 +53,7 @@ def get_device(name: str) -> Optional[Dict[str, Any]]:
 
 
 def _save_devices_and_update_cache(devices_to_save: Dict[str, Any], config_path: str = CONFIG_PATH) -> bool:
-    """Helper to save devices to file and update the cache."""
-    global _DEVICES_CACHE, _CACHED_CONFIG_PATH
+    """Helper to save devices to file and invalidate the cached config."""
     try:
         # Ensure the directory exists before trying to open the file for writing
         config_dir = os.path.dirname(config_path)
@@ -91,8 +61,7 @@ def _save_devices_and_update_cache(devices_to_save: Dict[str, Any], config_path:
              os.makedirs(config_dir, exist_ok=True)
         with open(config_path, "w") as file:
             json.dump(devices_to_save, file, indent=4)
-        _DEVICES_CACHE = devices_to_save.copy() # Update cache with a copy
-        _CACHED_CONFIG_PATH = config_path
+        clear_systems_config_cache()  # Next load re-reads the file we just wrote
         return True
     except (IOError, OSError) as e:
         logging.error(f"Failed to save device config to {config_path}: {e}")
@@ -190,16 +159,16 @@ def update_device(name: str, **kwargs) -> None:
     if name not in devices:
         speak(f"Device {name} not found in configuration.")
         return
-    for k, v in kwargs.items():
-        devices[name][k] = v
+    # New dict rather than in-place edits: the entry is shared with the cached config
+    devices[name] = {**devices[name], **kwargs}
     if _save_devices_and_update_cache(devices, CONFIG_PATH):
         speak(f"Device {name} updated successfully.")
     else:
         speak(f"Failed to update device {name}.")
 
 
-def _ping_ip(ip_address: str, timeout: int = 2) -> bool:
-    """Pings an IP address and returns True if online, False otherwise."""
+def ping_ip(ip_address: str, timeout: int = 2) -> bool:
+    """Sends a single ping without spoken feedback. Returns True if the host replied within the timeout."""
     if not ip_address:
         return False
     param = "-n" if platform.system().lower() == "windows" else "-c"
@@ -229,7 +198,7 @@ def check_all_device_statuses() -> None:
         if not ip:
             results.append(f"{name}: IP not set")
             continue
-        if _ping_ip(ip):
+        if ping_ip(ip):
             results.append(f"{name}: online")
         else:
             results.append(f"{name}: offline")
@@ -293,7 +262,7 @@ def ping_group(group: str) -> None:
         if not ip:
             results.append(f"{name}: IP not set")
             continue
-        if _ping_ip(ip):
+        if ping_ip(ip):
             results.append(f"{name}: online")
         else:
             results.append(f"{name}: offline")
@@ -3,12 +3,17 @@ Module: general.py
 Provides general utility actions such as telling the time and running self-tests.
 """
 
+import re
 import time
+from typing import List, Union
 from core.tts import speak
 import subprocess
 import sys
 import logging
 
+_LOG_LEVELS = {"info": logging.INFO, "warning": logging.WARNING, "error": logging.ERROR}
+_SPOKEN_LIST_SEPARATOR_RE = re.compile(r"\s*(?:,|\band\b)\s*")
+
 
 def tell_time() -> None:
     """
@@ -51,15 +56,23 @@ def log_and_speak(message: str, level: str = "info") -> None:
     
     Args:
         message: The message to log and speak.
-        level: The logging level to use ('info' or 'error').
+        level: The logging level to use ('info', 'warning' or 'error').
     """
-    if level == "info":
-        logging.info(message)
-    elif level == "error":
-        logging.error(message)
+    logging.log(_LOG_LEVELS.get(level, logging.INFO), message)
     speak(message)
 
 
+def split_spoken_list(names: Union[str, List[str], None]) -> List[str]:
+    """
+    Normalizes a spoken list such as "PC1, PC2 and PC3" (or an actual list) into its items.
+    """
+    if not names:
+        return []
+    if isinstance(names, str):
+        names = _SPOKEN_LIST_SEPARATOR_RE.split(names)
+    return [name.strip() for name in names if name and name.strip()]
+
+
 def hello() -> None:
     """
     Speaks a greeting message and prints a confirmation for the hello intent.
@@ -6,13 +6,10 @@ Provides functions to ping devices by name or IP, using configuration for known
 # Python
 import subprocess
 import platform
-import os
 import logging
 from core.tts import speak
 from modules.device_manager import get_device
-
-# Path relative to project root, assuming main.py is in project root
-CONFIG_PATH = os.path.join("modules", "configs", "systems_config.json")
+from modules.wol import CONFIG_PATH
 
 def _is_valid_ip_format(ip_string: str) -> bool:
     """
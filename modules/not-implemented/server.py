@@ -3,38 +3,71 @@ Module: server.py
 Provides functions to boot and verify servers using Wake-on-LAN and ping.
 """
 
-import os
 import logging
+import threading
 import time
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
 from core.tts import speak
-from modules.wol import send_wol_packet
-from modules.ping import ping_target
-from modules.device_manager import get_device
+from modules.general import log_and_speak, split_spoken_list
+from modules.wol import CONFIG_PATH, load_systems_config, send_wol_packet, send_wol_packets_batch
+from modules.device_manager import get_device, ping_ip
 
-CONFIG_PATH = os.path.join("modules", "configs", "systems_config.json")
+BOOT_MAX_WAIT = 90  # seconds to keep polling a booting server before giving up
+BOOT_POLL_INTERVAL = 5  # seconds between pings while waiting for a server to come up
+
+# get_device results keyed by lowercased name, valid for the config dict they were found in
+_device_cache: Dict[str, Optional[Dict[str, Any]]] = {}
+_device_cache_source: Optional[Dict[str, Any]] = None
+
+
+def _get_device_cached(name: str) -> Optional[Dict[str, Any]]:
+    """
+    Memoizes device_manager.get_device by name. load_systems_config returns the same dict
+    until the file changes, so a new dict means the memoized entries are stale.
+    """
+    global _device_cache_source
+    systems = load_systems_config(CONFIG_PATH)
+    if systems is not _device_cache_source:
+        _device_cache.clear()
+        _device_cache_source = systems
+    key = name.lower()
+    if key not in _device_cache:
+        _device_cache[key] = get_device(name)
+    return _device_cache[key]
 
 def boot_system(system_name: str) -> None:
     """
     Boots the specified system using the device manager for config lookup.
     """
-    device = get_device(system_name)
+    device = _get_device_cached(system_name)
     if not device or "mac_address" not in device:
-        response = f"MAC address for '{system_name}' is missing or device not found."
-        logging.error(response)
-        speak(response)
+        log_and_speak(f"MAC address for '{system_name}' is missing or device not found.", level="error")
         return
-    response_start = f"Sending WOL packet to '{system_name}'."
-    logging.info(response_start)
-    speak(response_start)
+    log_and_speak(f"Sending WOL packet to '{system_name}'.")
     success = send_wol_packet(str(device["mac_address"]))
-    response_end = f"Boot command {'successful' if success else 'failed'} for '{system_name}'."
-    logging.info(response_end)
-    speak(response_end)
+    log_and_speak(f"Boot command {'successful' if success else 'failed'} for '{system_name}'.")
+
+def _poll_until_up(
+    server_name: str, ip_address: str, max_wait: int = BOOT_MAX_WAIT, interval: int = BOOT_POLL_INTERVAL
+) -> bool:
+    """
+    Pings a booting server every `interval` seconds and announces it as soon as it responds.
+    Gives up after `max_wait` seconds. Intended to run on a background thread.
+    """
+    logging.info(f"Polling {server_name} at {ip_address} every {interval}s for up to {max_wait}s.")
+    for _ in range(max_wait // interval):
+        time.sleep(interval)
+        if ping_ip(ip_address):
+            log_and_speak(f"{server_name} is up and responding to ping.")
+            return True
+    log_and_speak(f"{server_name} did not respond to ping within {max_wait} seconds.", level="warning")
+    return False
 
 def start_server(server_name: Optional[str] = None) -> None:
     """
-    Starts a server using Wake-on-LAN and attempts to verify its availability via ping, using device manager.
+    Starts a server using Wake-on-LAN and polls it with ping to verify its availability.
+    Returns immediately; the polling runs in the background and announces when the server is up.
     """
     if not server_name:
         speak_msg = "Please specify which server you want to start. For example, say 'start server MyServerName'."
@@ -45,11 +78,9 @@ def start_server(server_name: Optional[str] = None) -> None:
     logging.info(f"Received request to start and verify server: {server_name}.")
     speak(f"Attempting to start and verify server {server_name}.")
 
-    device = get_device(server_name)
+    device = _get_device_cached(server_name)
     if not device or "mac_address" not in device:
-        response = f"Server '{server_name}' not found or missing MAC address."
-        logging.error(response)
-        speak(response)
+        log_and_speak(f"Server '{server_name}' not found or missing MAC address.", level="error")
         return
 
     mac_address = device.get("mac_address")
@@ -61,20 +92,59 @@ def start_server(server_name: Optional[str] = None) -> None:
     if wol_success:
         speak(f"Wake-on-LAN packet sent to {server_name}.")
         if ip_address:
-            boot_wait_time = 60  # seconds
-            logging.info(f"Waiting {boot_wait_time} seconds for {server_name} to boot before pinging.")
-            speak(f"I'll wait about a minute for {server_name} to boot, then I'll try to ping it.")
-            time.sleep(boot_wait_time)
-            logging.info(f"Attempting to ping {server_name} at {ip_address}.")
-            ping_target(server_name)
+            speak(f"I'll let you know as soon as {server_name} responds to ping.")
+            threading.Thread(target=_poll_until_up, args=(server_name, ip_address), daemon=True).start()
         else:
-            no_ip_response = f"{server_name} has been sent a boot command, but I cannot verify its status as its IP address is not configured."
-            logging.warning(no_ip_response)
-            speak(no_ip_response)
+            log_and_speak(f"{server_name} has been sent a boot command, but I cannot verify its status as its IP address is not configured.", level="warning")
+    else:
+        log_and_speak(f"Failed to send Wake-on-LAN packet to {server_name}.", level="error")
+
+def _verify_servers_after_boot(targets: List[Tuple[str, str]]) -> None:
+    """
+    Polls every booted server concurrently until each responds or times out.
+    """
+    with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+        for server_name, ip_address in targets:
+            executor.submit(_poll_until_up, server_name, ip_address)
+
+def boot_systems(names: Union[str, List[str], None] = None) -> None:
+    """
+    Boots several systems at once: WOL packets go out in one batch over a shared socket
+    and every system is then polled concurrently instead of one after another.
+    """
+    system_names = split_spoken_list(names)
+    if not system_names:
+        speak("Please tell me which systems to boot. For example, say 'boot systems PC1 and PC2'.")
+        return
+
+    devices = {}
+    for name in system_names:
+        device = _get_device_cached(name)
+        if not device or "mac_address" not in device:
+            log_and_speak(f"MAC address for '{name}' is missing or device not found.", level="error")
+            continue
+        devices[name] = device
+    if not devices:
+        return
+
+    logging.info(f"Sending WOL packets to: {', '.join(devices)}.")
+    speak(f"Sending Wake-on-LAN packets to {', '.join(devices)}.")
+    sent = send_wol_packets_batch([str(device["mac_address"]) for device in devices.values()])
+    results = {name: sent[str(device["mac_address"])] for name, device in devices.items()}
+
+    booted = [name for name, success in results.items() if success]
+    failed = [name for name, success in results.items() if not success]
+    if failed:
+        log_and_speak(f"Failed to send Wake-on-LAN packet to {', '.join(failed)}.", level="error")
+    if not booted:
+        return
+
+    targets = [(name, devices[name]["ip_address"]) for name in booted if devices[name].get("ip_address")]
+    if targets:
+        speak(f"Boot commands sent to {', '.join(booted)}. I'll let you know as each one comes up.")
+        threading.Thread(target=_verify_servers_after_boot, args=(targets,), daemon=True).start()
     else:
-        response = f"Failed to send Wake-on-LAN packet to {server_name}."
-        logging.error(response)
-        speak(response)
+        speak(f"Boot commands sent to {', '.join(booted)}.")
 
 def stop_server() -> None:
     """
@@ -95,4 +165,5 @@ def register_intents() -> dict:
     return {
         "start server": start_server,
         "stop server": stop_server,
+        "boot systems": boot_systems,
     }
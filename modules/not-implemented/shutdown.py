@@ -3,13 +3,27 @@ Module: shutdown.py
 Provides functionality to shut down the computer with user confirmation.
 """
 
-import os
 import platform
 import logging
+import subprocess
 import time
 from core.tts import speak
 from typing import Optional
 
+# The host OS does not change while the assistant runs, so resolve it once
+_SYSTEM_OS = platform.system().lower()
+
+# Shutdown commands per OS, pre-split so they can be spawned without a shell.
+# Linux and macOS typically require sudo privileges: ensure the user running the script
+# has passwordless sudo for 'shutdown' or is running as root. Alternatives are
+# 'systemctl poweroff' on systemd systems and 'osascript -e \'tell app "System Events" to shut down\''
+# on macOS, which might not require sudo but can be less forceful.
+_SHUTDOWN_CMDS = {
+    "windows": ("shutdown", "/s", "/f", "/t", "1"),  # Force close applications, shutdown in 1 sec
+    "linux": ("sudo", "shutdown", "-h", "now"),
+    "darwin": ("sudo", "shutdown", "-h", "now"),  # macOS
+}
+
 class AssistantExitSignal(Exception):
     """Custom exception to signal the assistant to shut down."""
     pass
@@ -20,31 +34,23 @@ def _perform_shutdown() -> None:
     Actually executes the system shutdown command after confirmation.
     Provides spoken feedback and attempts to log the action.
     """
-    system_os = platform.system().lower()
+    system_os = _SYSTEM_OS
     logging.info(f"Shutdown confirmed. Attempting to shut down the system ({system_os}).")
     speak("Shutting down now. Goodbye!")
 
     # A small delay to allow TTS to finish, though it might be interrupted by the OS.
     time.sleep(2)
 
+    command = _SHUTDOWN_CMDS.get(system_os)
+    if command is None:
+        logging.warning(f"Shutdown command not implemented for operating system: {system_os}")
+        speak(f"Sorry, I don't know how to shut down a {system_os} system.")
+        return
+
     try:
-        if system_os == "windows":
-            os.system("shutdown /s /f /t 1")  # Force close applications, shutdown in 1 sec
-        elif system_os == "linux":
-            # This command typically requires sudo privileges.
-            # Ensure the user running the script has passwordless sudo for 'shutdown'
-            # or is running as root. Alternatively, 'systemctl poweroff' can be used on systemd systems.
-            logging.info("Executing Linux shutdown. This may require sudo privileges.")
-            os.system("sudo shutdown -h now")
-        elif system_os == "darwin":  # macOS
-            # This command typically requires sudo privileges.
-            # 'osascript -e \'tell app "System Events" to shut down\'' is an alternative
-            # that might not require sudo but can be less forceful.
-            logging.info("Executing macOS shutdown. This may require sudo privileges.")
-            os.system("sudo shutdown -h now")
-        else:
-            logging.warning(f"Shutdown command not implemented for operating system: {system_os}")
-            speak(f"Sorry, I don't know how to shut down a {system_os} system.")
+        if command[0] == "sudo":
+            logging.info(f"Executing {system_os} shutdown. This may require sudo privileges.")
+        subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL)
     except Exception as e:
         logging.error(f"An error occurred while trying to execute shutdown command: {e}", exc_info=True)
         # Speak might not work if system is already shutting down, but try.
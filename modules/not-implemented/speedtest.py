@@ -4,19 +4,41 @@ Runs an internet speed test and provides results via TTS.
 """
 import speedtest
 import logging
+import time
+from typing import Optional, Tuple
 from core.tts import speak
 
+# How long a client (and its best-server selection) is reused before being rebuilt
+SPEEDTEST_CLIENT_TTL = 300  # seconds
+
+# Cached client and the time it was created
+_st_client: Optional[Tuple[speedtest.Speedtest, float]] = None
+
+def _get_speedtest_client() -> speedtest.Speedtest:
+    """
+    Returns a Speedtest client with its best server already selected.
+    
+    Building a client downloads the server list and probes server latency, so the result is cached for SPEEDTEST_CLIENT_TTL seconds.
+    """
+    global _st_client
+    if _st_client is not None and time.time() - _st_client[1] < SPEEDTEST_CLIENT_TTL:
+        return _st_client[0]
+    st = speedtest.Speedtest()
+    st.get_best_server()
+    _st_client = (st, time.time())
+    return st
+
 def run_speedtest() -> None:
     """
     Runs an internet speed test and announces the results using text-to-speech.
     
     Measures download and upload speeds in Mbps, logs the results, and speaks them aloud. If an error occurs during the test, notifies the user via text-to-speech.
     """
+    global _st_client
     logging.info("Running speed test...")
     speak("Running a speed test.")
     try:
-        st = speedtest.Speedtest()
-        st.get_best_server()
+        st = _get_speedtest_client()
         download_speed = st.download() / 1_000_000  # Convert to Mbps
         upload_speed = st.upload() / 1_000_000  # Convert to Mbps
         logging.info(f"Download Speed: {download_speed:.2f} Mbps")
@@ -24,6 +46,7 @@ def run_speedtest() -> None:
         speak(f"Download speed is {download_speed:.2f} Mbps.")
         speak(f"Upload speed is {upload_speed:.2f} Mbps.")
     except Exception as e:
+        _st_client = None  # Don't keep reusing a client that may have gone bad
         logging.error(f"Failed to run speed test: {e}")
         speak("I encountered an error while running the speed test.")
 
@@ -7,11 +7,68 @@ import psutil
 import os
 import platform
 import datetime
+import functools
 import time # For boot_time
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from core.tts import speak
 from typing import Optional
 
+# Host properties that cannot change while the assistant is running
+_IS_WINDOWS = platform.system().lower() == "windows"
+_DEFAULT_DISK = "C:\\" if _IS_WINDOWS else "/"
+
+@functools.lru_cache(maxsize=1)
+def _get_boot_time() -> float:
+    """Returns the system boot timestamp, queried from psutil only once."""
+    return psutil.boot_time()
+
+# Shared pool for running independent psutil probes concurrently
+_PROBE_EXECUTOR = ThreadPoolExecutor(max_workers=3, thread_name_prefix="system_info")
+
+# CPU usage is sampled continuously in the background so handlers never block on a sample
+CPU_SAMPLE_INTERVAL = 1.0  # seconds per background CPU sample
+_cpu_percent_latest: Optional[float] = None
+_cpu_sampler_started = False
+_cpu_sampler_lock = threading.Lock()
+
+def _cpu_sampler() -> None:
+    """Keeps _cpu_percent_latest updated with the CPU usage over the last sample interval."""
+    global _cpu_percent_latest
+    while True:
+        try:
+            _cpu_percent_latest = psutil.cpu_percent(interval=CPU_SAMPLE_INTERVAL)
+        except Exception as e:
+            logging.debug(f"CPU sampler: Failed to sample CPU usage: {e}")
+            time.sleep(CPU_SAMPLE_INTERVAL)
+
+def _start_cpu_sampler() -> None:
+    """Starts the background CPU sampler thread once."""
+    global _cpu_sampler_started
+    with _cpu_sampler_lock:
+        if _cpu_sampler_started:
+            return
+        threading.Thread(target=_cpu_sampler, name="cpu_sampler", daemon=True).start()
+        _cpu_sampler_started = True
+
+def _get_cpu_percent(fallback_interval: float) -> Optional[float]:
+    """
+    Returns the latest background CPU sample without waiting.
+    
+    Until the sampler has produced its first value, measures directly over fallback_interval seconds.
+    """
+    if _cpu_percent_latest is not None:
+        return _cpu_percent_latest
+    _start_cpu_sampler()
+    return psutil.cpu_percent(interval=fallback_interval)
+
+def _default_disk_usage():
+    """Returns psutil disk usage for the main drive, or None if its path does not exist."""
+    if not os.path.exists(_DEFAULT_DISK): # Check existence before calling psutil.disk_usage
+        return None
+    return psutil.disk_usage(_DEFAULT_DISK)
+
 def bytes_to_gb(bytes_val: int) -> str:
     """
     Converts a byte value to a string representing gigabytes with two decimal places.
@@ -25,6 +82,8 @@ def bytes_to_gb(bytes_val: int) -> str:
     gb_val = bytes_val / (1024**3)
     return f"{gb_val:.2f} GB"
 
+_UPTIME_UNITS = ("day", "hour", "minute")
+
 def format_uptime(seconds: int) -> str:
     """
     Converts a duration in seconds into a human-readable string with days, hours, and minutes.
@@ -35,18 +94,14 @@ def format_uptime(seconds: int) -> str:
     Returns:
         A string expressing the duration in days, hours, and minutes with proper pluralization and conjunctions. Returns "less than a minute" if the duration is under one minute.
     """
-    days = int(seconds // (24 * 3600))
-    seconds %= (24 * 3600)
-    hours = int(seconds // 3600)
-    seconds %= 3600
-    minutes = int(seconds // 60)
-    parts = []
-    if days > 0:
-        parts.append(f"{days} day{'s' if days != 1 else ''}")
-    if hours > 0:
-        parts.append(f"{hours} hour{'s' if hours != 1 else ''}")
-    if minutes > 0:
-        parts.append(f"{minutes} minute{'s' if minutes != 1 else ''}")
+    days, remainder = divmod(int(seconds), 24 * 3600)
+    hours, remainder = divmod(remainder, 3600)
+    minutes = remainder // 60
+    parts = [
+        f"{value} {unit}{'s' if value != 1 else ''}"
+        for value, unit in zip((days, hours, minutes), _UPTIME_UNITS)
+        if value > 0
+    ]
     if not parts:
         return "less than a minute"
     elif len(parts) == 1:
@@ -63,7 +118,7 @@ def get_cpu_usage_speak() -> None:
     If CPU usage cannot be determined or an error occurs, a spoken error message is provided.
     """
     try:
-        cpu_percent = psutil.cpu_percent(interval=1)
+        cpu_percent = _get_cpu_percent(fallback_interval=1)
         if cpu_percent is not None:
             speak(f"Current CPU usage is {cpu_percent:.1f} percent.")
             logging.info(f"CPU Usage: {cpu_percent:.1f}%")
@@ -100,12 +155,8 @@ def get_disk_usage_speak(path_argument: Optional[str] = None) -> None:
     target_path = path_argument
     path_display_name = "the main drive"
     if not target_path:
-        if platform.system().lower() == "windows": # Corrected line
-            target_path = "C:\\"
-            path_display_name = "drive C"
-        else:
-            target_path = "/" # Root for Linux/macOS
-            path_display_name = "the root filesystem"
+        target_path = _DEFAULT_DISK
+        path_display_name = "drive C" if _IS_WINDOWS else "the root filesystem"
         logging.info(f"No path specified for disk usage, defaulting to '{target_path}'.")
     else:
         path_display_name = f"the path {target_path}"
@@ -132,7 +183,7 @@ def get_system_uptime_speak():
     Calculates the time elapsed since the system booted and announces it using text-to-speech. Logs the uptime and boot timestamp. If an error occurs, a spoken error message is provided.
     """
     try:
-        boot_timestamp = psutil.boot_time()
+        boot_timestamp = _get_boot_time()
         current_timestamp = time.time()
         uptime_seconds = current_timestamp - boot_timestamp
         uptime_str = format_uptime(int(uptime_seconds))
@@ -146,14 +197,19 @@ def get_system_summary_speak():
     """
     Speaks a summary of the system's CPU usage, memory usage, main disk usage, and uptime.
     
-    Attempts to retrieve each metric individually, providing a combined spoken summary of available information. If no data can be retrieved, informs the user accordingly.
+    Retrieves each metric concurrently, providing a combined spoken summary of available information. If no data can be retrieved, informs the user accordingly.
     """
+    # Start the probes first so they run while the acknowledgement is being spoken
+    cpu_future = _PROBE_EXECUTOR.submit(_get_cpu_percent, 0.5) # Shorter fallback interval for summary
+    mem_future = _PROBE_EXECUTOR.submit(psutil.virtual_memory)
+    disk_future = _PROBE_EXECUTOR.submit(_default_disk_usage)
+
     speak("Getting system status summary.")
     logging.info("ACTION: Getting system status summary...")
 
     summary_parts = []
     try:
-        cpu_percent = psutil.cpu_percent(interval=0.5) # Shorter interval for summary
+        cpu_percent = cpu_future.result()
         if cpu_percent is not None:
             summary_parts.append(f"CPU at {cpu_percent:.1f} percent")
     except Exception as e_cpu:
@@ -161,23 +217,22 @@ def get_system_summary_speak():
         pass # Ignore individual errors for summary, just skip part
 
     try:
-        mem = psutil.virtual_memory()
+        mem = mem_future.result()
         summary_parts.append(f"memory at {mem.percent:.1f} percent")
     except Exception as e_mem:
         logging.debug(f"System Summary: Failed to get Memory info: {e_mem}")
         pass
 
     try:
-        default_disk_path = "C:\\" if platform.system().lower() == "windows" else "/"
-        if os.path.exists(default_disk_path): # Check existence before calling psutil.disk_usage
-             disk = psutil.disk_usage(default_disk_path)
-             summary_parts.append(f"main disk at {disk.percent:.1f} percent")
+        disk = disk_future.result()
+        if disk is not None:
+            summary_parts.append(f"main disk at {disk.percent:.1f} percent")
     except Exception as e_disk:
         logging.debug(f"System Summary: Failed to get Disk info: {e_disk}")
         pass
 
     try:
-        boot_timestamp = psutil.boot_time()
+        boot_timestamp = _get_boot_time()
         uptime_seconds = time.time() - boot_timestamp
         uptime_str = format_uptime(int(uptime_seconds))
         summary_parts.append(f"uptime is {uptime_str}")
@@ -223,6 +278,7 @@ def register_intents():
     
     The returned dictionary associates various user phrases with functions that provide spoken system status, CPU usage, memory usage, disk usage, uptime, and load averages. This enables integration with a voice assistant framework for handling system information queries.
     """
+    _start_cpu_sampler()
     intents = {
         "system status": get_system_summary_speak,
         "tell me system status": get_system_summary_speak,
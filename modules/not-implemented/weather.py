@@ -5,14 +5,34 @@ Fetches and speaks the current weather for a given city using Open-Meteo API.
 
 import os
 import json
-import requests
+import time
+import asyncio
+import atexit
+import functools
+import aiohttp
+import orjson
 import logging
+from typing import Dict, List, Optional, Tuple, Union
 from core.tts import speak
+from modules.general import split_spoken_list
 
 # API URLs
 GEOCODING_API_URL = "https://geocoding-api.open-meteo.com/v1/search"
 FORECAST_API_URL = "https://api.open-meteo.com/v1/forecast"
 
+# Shared aiohttp session with keep-alive connection pooling, created lazily because it must belong to the running loop
+_aiohttp_session: Optional[aiohttp.ClientSession] = None
+_aiohttp_session_loop: Optional[asyncio.AbstractEventLoop] = None
+_AIOHTTP_TIMEOUT = aiohttp.ClientTimeout(total=5)
+# Strong references to dispatched intent tasks; the loop only keeps weak ones, so unreferenced tasks could be collected mid-flight
+_background_tasks: set = set()
+
+# City coordinates don't change, so geocoding results are kept in memory and on disk
+GEOCODE_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "va_geocode.json")
+GEOCODE_CACHE_TTL = 30 * 24 * 3600  # seconds
+GEOCODE_CACHE_MAX_ENTRIES = 256
+_GEOCODE_ENTRY_KEYS = frozenset({"ts", "lat", "lon", "name"})
+
 # WMO Weather interpretation codes (https://open-meteo.com/en/docs#weathervariables)
 # This is a partial list for brevity; a more complete one can be added.
 WMO_WEATHER_CODES = {
@@ -46,106 +66,283 @@ WMO_WEATHER_CODES = {
     99: "Thunderstorm with heavy hail" # Only if specified in docs, otherwise 95 covers most
 }
 
+_UNKNOWN_WEATHER = "an unknown weather condition"
+# WMO codes are small non-negative ints, so a flat table indexed by code replaces the dict lookup
+_WMO_TABLE = tuple(WMO_WEATHER_CODES.get(i, _UNKNOWN_WEATHER) for i in range(100))
+
 def get_weather_wmo_description(code: int) -> str:
     """
     Returns a human-readable description for the given WMO weather code.
     
     If the code is not recognized, returns "an unknown weather condition".
     """
-    return WMO_WEATHER_CODES.get(code, "an unknown weather condition")
+    if isinstance(code, int) and 0 <= code < len(_WMO_TABLE):
+        return _WMO_TABLE[code]
+    return _UNKNOWN_WEATHER
 
-def get_weather(city_name: str) -> None:
+def _load_geocode_cache() -> Dict[str, Dict]:
     """
-    Fetches and vocalizes the current weather for a specified city using the Open-Meteo API.
-    
-    If the city name is empty, attempts to use the default city from the environment variable `DEFAULT_WEATHER_CITY`. If no valid city is provided, prompts the user to specify one. Handles geocoding and weather data retrieval, providing spoken feedback and error messages as appropriate.
+    Loads persisted geocoding results, dropping entries older than GEOCODE_CACHE_TTL.
+    """
+    try:
+        with open(GEOCODE_CACHE_PATH, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    # Runs at import time, so a file with an unexpected shape must fall back to an empty cache
+    if not isinstance(entries, dict):
+        return {}
+    now = time.time()
+    return {
+        key: entry for key, entry in entries.items()
+        if isinstance(entry, dict)
+        and _GEOCODE_ENTRY_KEYS <= entry.keys()
+        and isinstance(entry["ts"], (int, float))
+        and now - entry["ts"] < GEOCODE_CACHE_TTL
+    }
+
+_geocode_disk_cache: Dict[str, Dict] = _load_geocode_cache()
+
+@atexit.register
+def _save_geocode_cache() -> None:
+    """
+    Writes the geocoding cache back to disk on interpreter exit.
+    """
+    if not _geocode_disk_cache:
+        return
+    try:
+        os.makedirs(os.path.dirname(GEOCODE_CACHE_PATH), exist_ok=True)
+        with open(GEOCODE_CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump(_geocode_disk_cache, f)
+    except OSError as e:
+        logging.warning(f"Could not save geocoding cache: {e}")
+
+def _cached_geocode(city_key: str) -> Optional[Tuple[float, float, str]]:
+    """
+    Returns a fresh geocoding result for the city key from the shared cache, or None.
+    """
+    entry = _geocode_disk_cache.get(city_key)
+    if entry and time.time() - entry["ts"] < GEOCODE_CACHE_TTL:
+        return entry["lat"], entry["lon"], entry["name"]
+    return None
+
+def _parse_geocode(city_key: str, geo_data: Dict) -> Optional[Tuple[float, float, str]]:
+    """
+    Extracts (latitude, longitude, canonical name) from a geocoding response and caches it.
+    """
+    results = geo_data.get("results")
+    if not results:
+        return None
+    location = results[0]
+    lat = location.get("latitude")
+    lon = location.get("longitude")
+    if lat is None or lon is None:
+        return None
+    name = location.get("name", city_key)
+    # Dicts keep insertion order, so re-inserting at the end and trimming from the front
+    # evicts the least recently geocoded city once the cache is full.
+    _geocode_disk_cache.pop(city_key, None)
+    _geocode_disk_cache[city_key] = {"lat": lat, "lon": lon, "name": name, "ts": time.time()}
+    while len(_geocode_disk_cache) > GEOCODE_CACHE_MAX_ENTRIES:
+        del _geocode_disk_cache[next(iter(_geocode_disk_cache))]
+    return lat, lon, name
+
+@functools.lru_cache(maxsize=256)
+def _forecast_url(lat: float, lon: float) -> str:
+    """
+    Builds the full current-weather URL for a location once, so repeat queries skip param encoding.
+    """
+    return f"{FORECAST_API_URL}?latitude={lat}&longitude={lon}&current_weather=true"
+
+def _resolve_city_name(city_name: str) -> Optional[str]:
+    """
+    Returns the requested city, falling back to DEFAULT_WEATHER_CITY, or None if neither is set.
     """
     # Use environment variable as fallback if city_name is empty
     if (not city_name or not city_name.strip()) and os.environ.get("DEFAULT_WEATHER_CITY"):
         city_name = os.environ["DEFAULT_WEATHER_CITY"]
         logging.info(f"No city provided, using default from environment: {city_name}")
-
     if not city_name or not city_name.strip():
-        speak("You need to tell me a city name to get the weather for.")
+        return None
+    return city_name
+
+async def _speak(text: str) -> None:
+    """
+    Runs the blocking speak() call in a worker thread so the event loop stays responsive.
+    """
+    await asyncio.to_thread(speak, text)
+
+async def _speak_current_weather(city_name: str, weather_data: Dict) -> None:
+    """
+    Speaks the current conditions from an Open-Meteo forecast response.
+    """
+    current = weather_data.get("current_weather", {})
+    temp = current.get("temperature")
+    code = current.get("weathercode")
+    desc = get_weather_wmo_description(code)
+
+    if temp is not None and desc:
+        await _speak(f"The current weather in {city_name} is {desc} with a temperature of {temp} degrees Celsius.")
+        logging.info(f"Weather for {city_name}: {desc}, {temp}°C")
+    else:
+        await _speak(f"Sorry, I couldn't get the weather details for {city_name}.")
+
+def _get_aiohttp_session() -> aiohttp.ClientSession:
+    """
+    Returns the shared aiohttp session, recreating it if it was closed or belongs to another loop.
+    """
+    global _aiohttp_session, _aiohttp_session_loop
+    loop = asyncio.get_running_loop()
+    if _aiohttp_session is None or _aiohttp_session.closed or _aiohttp_session_loop is not loop:
+        _aiohttp_session = aiohttp.ClientSession(timeout=_AIOHTTP_TIMEOUT)
+        _aiohttp_session_loop = loop
+    return _aiohttp_session
+
+async def _geocode_async(session: aiohttp.ClientSession, city_name: str) -> Optional[Tuple[float, float, str]]:
+    """
+    Resolves a city to (latitude, longitude, canonical name), using the cache when possible.
+
+    Returns None if no location matches; network and decoding errors propagate.
+    """
+    city_key = city_name.strip().lower()
+    geocoded = _cached_geocode(city_key)
+    if geocoded:
+        return geocoded
+    geo_params = {"name": city_key, "count": 1, "format": "json"}
+    async with session.get(GEOCODING_API_URL, params=geo_params) as geo_response:
+        geo_response.raise_for_status()
+        return _parse_geocode(city_key, await geo_response.json(loads=orjson.loads))
+
+async def _forecast_async(session: aiohttp.ClientSession, lat: float, lon: float) -> Dict:
+    """
+    Fetches the Open-Meteo current-weather response for a location.
+    """
+    async with session.get(_forecast_url(lat, lon)) as weather_response:
+        weather_response.raise_for_status()
+        return await weather_response.json(loads=orjson.loads)
+
+async def _full_weather(session: aiohttp.ClientSession, city_name: str) -> Optional[Dict]:
+    """
+    Geocodes a city and fetches its current weather; returns None if the city is unknown.
+    """
+    geocoded = await _geocode_async(session, city_name)
+    if not geocoded:
+        return None
+    lat, lon, _ = geocoded
+    return await _forecast_async(session, lat, lon)
+
+async def get_weather(city_name: str) -> None:
+    """
+    Fetches and vocalizes the current weather for a specified city using the Open-Meteo API.
+    
+    If the city name is empty, attempts to use the default city from the environment variable `DEFAULT_WEATHER_CITY`. If no valid city is provided, prompts the user to specify one. Handles geocoding and weather data retrieval, providing spoken feedback and error messages as appropriate.
+
+    Both HTTP calls are awaited on a shared aiohttp session, and speech runs in a worker thread,
+    so the event loop is never blocked.
+    """
+    city_name = _resolve_city_name(city_name)
+    if not city_name:
+        await _speak("You need to tell me a city name to get the weather for.")
         return
 
     logging.info(f"Getting weather for {city_name}...")
-    speak(f"Getting weather for {city_name}.")
+    await _speak(f"Getting weather for {city_name}.")
+    session = _get_aiohttp_session()
 
-    lat, lon = None, None
-    # --- 1. Geocode city name to latitude/longitude ---
     try:
-        geo_params = {"name": city_name, "count": 1, "format": "json"}
-        geo_response = requests.get(GEOCODING_API_URL, params=geo_params, timeout=5)
-        geo_response.raise_for_status()
-        geo_data = geo_response.json()
-
-        if geo_data.get("results") and len(geo_data["results"]) > 0:
-            location = geo_data["results"][0]
-            lat = location.get("latitude")
-            lon = location.get("longitude")
-            actual_city_name = location.get("name", city_name) # Use name from API if available
-            logging.info(f"Geocoded {city_name} to {actual_city_name} at ({lat}, {lon})")
-        else:
-            speak(f"Sorry, I couldn't find a location named {city_name}.")
-            return
-
-    except requests.exceptions.Timeout:
+        geocoded = await _geocode_async(session, city_name)
+    except asyncio.TimeoutError:
         logging.error(f"Timeout while geocoding city: {city_name}")
-        speak("Sorry, the location lookup service timed out.")
+        await _speak("Sorry, the location lookup service timed out.")
         return
-    except requests.exceptions.RequestException as e_geo:
+    except (aiohttp.ClientError, json.JSONDecodeError) as e_geo:
         logging.error(f"Error geocoding city {city_name}: {e_geo}")
-        speak(f"Sorry, I had trouble looking up the location for {city_name}.")
+        await _speak(f"Sorry, I had trouble looking up the location for {city_name}.")
         return
-    except json.JSONDecodeError:
-        logging.error(f"Error decoding JSON response for geocoding {city_name}")
-        speak("Sorry, I received an unexpected response when looking up the location.")
+    if not geocoded:
+        await _speak(f"Sorry, I couldn't find a location named {city_name}.")
         return
+    lat, lon, actual_city_name = geocoded
+    logging.info(f"Geocoded {city_name} to {actual_city_name} at ({lat}, {lon})")
 
-    if lat is None or lon is None:
-        # This case should ideally be caught by earlier checks, but as a safeguard:
-        speak(f"Sorry, I couldn't get the coordinates for {city_name}.")
-        return
-
-    # --- 2. Get current weather using latitude/longitude ---
     try:
-        weather_params = {
-            "latitude": lat,
-            "longitude": lon,
-            "current_weather": True,
-        }
-        weather_response = requests.get(FORECAST_API_URL, params=weather_params, timeout=5)
-        weather_response.raise_for_status()
-        weather_data = weather_response.json()
-        current = weather_data.get("current_weather", {})
-        temp = current.get("temperature")
-        code = current.get("weathercode")
-        desc = get_weather_wmo_description(code)
-
-        if temp is not None and desc:
-            speak(f"The current weather in {city_name} is {desc} with a temperature of {temp} degrees Celsius.")
-            logging.info(f"Weather for {city_name}: {desc}, {temp}°C")
-        else:
-            speak(f"Sorry, I couldn't get the weather details for {city_name}.")
-    except requests.exceptions.Timeout:
+        await _speak_current_weather(city_name, await _forecast_async(session, lat, lon))
+    except asyncio.TimeoutError:
         logging.error(f"Timeout while fetching weather for {city_name}")
-        speak("Sorry, the weather service timed out.")
-    except requests.exceptions.RequestException as e_weather:
+        await _speak("Sorry, the weather service timed out.")
+    except (aiohttp.ClientError, json.JSONDecodeError) as e_weather:
         logging.error(f"Error fetching weather for {city_name}: {e_weather}")
-        speak(f"Sorry, I had trouble getting the weather for {city_name}.")
-    except json.JSONDecodeError:
-        logging.error(f"Error decoding JSON response for weather in {city_name}")
-        speak("Sorry, I received an unexpected response from the weather service.")
+        await _speak(f"Sorry, I had trouble getting the weather for {city_name}.")
+
+async def get_weather_for_cities(city_names: Union[str, List[str]]) -> None:
+    """
+    Fetches and vocalizes the current weather for several cities at once.
+
+    Every city is geocoded and forecast concurrently, so the total wait is roughly that of the
+    slowest city rather than the sum of all of them.
+    """
+    cities = split_spoken_list(city_names)
+    if len(cities) <= 1:
+        await get_weather(cities[0] if cities else "")
+        return
+
+    logging.info(f"Getting weather for {cities}...")
+    await _speak(f"Getting weather for {', '.join(cities)}.")
+    session = _get_aiohttp_session()
+    results = await asyncio.gather(*(_full_weather(session, city) for city in cities), return_exceptions=True)
+    for city, result in zip(cities, results):
+        if isinstance(result, Exception):
+            logging.error(f"Error fetching weather for {city}: {result}")
+            await _speak(f"Sorry, I had trouble getting the weather for {city}.")
+        elif result is None:
+            await _speak(f"Sorry, I couldn't find a location named {city}.")
+        else:
+            await _speak_current_weather(city, result)
+
+async def _run_standalone(coro) -> None:
+    """
+    Runs a weather coroutine in a private event loop and closes the session bound to that loop.
+    """
+    try:
+        await coro
+    finally:
+        if _aiohttp_session is not None:
+            await _aiohttp_session.close()
+
+def _on_task_done(task: asyncio.Task) -> None:
+    """
+    Drops a finished intent task from the strong-reference set and logs any exception it raised.
+    """
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logging.error(f"Weather task failed: {task.exception()}", exc_info=task.exception())
+
+def _dispatch(handler):
+    """
+    Wraps a weather coroutine function for the intent table: inside an event loop it is
+    scheduled as a task, otherwise it runs to completion with asyncio.run for synchronous callers.
+    """
+    @functools.wraps(handler)
+    def dispatcher(arg):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(_run_standalone(handler(arg)))
+        task = loop.create_task(handler(arg))
+        _background_tasks.add(task)
+        task.add_done_callback(_on_task_done)
+        return task
+    return dispatcher
 
 def register_intents() -> dict:
     """
     Registers weather-related intents for integration with the main application.
     
     Returns:
-        A dictionary mapping intent strings to the get_weather function.
+        A dictionary mapping intent strings to the weather dispatcher.
     """
     return {
-        "get weather": get_weather,
-        "weather in": get_weather,
+        "get weather": _dispatch(get_weather),
+        "weather in": _dispatch(get_weather),
+        "weather for cities": _dispatch(get_weather_for_cities),
     }
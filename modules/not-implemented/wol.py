@@ -3,31 +3,45 @@ Module: wol.py
 Provides Wake-on-LAN functionality for network devices.
 """
 
-import json
+import functools
 import socket
 import logging
 import re
 import os
-from typing import Dict, Any
+import threading
+import orjson
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple, Union
 from core.tts import speak
-from modules.device_manager import get_device
 
-# Default config path for consistency with other modules
-CONFIG_PATH = os.path.join("modules", "configs", "systems_config.json")
+# Systems config shared by every device module; resolved from this file so it doesn't depend on the working directory
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "configs", "systems_config.json")
+WOL_BROADCAST_ADDRESS = ("255.255.255.255", 9)
+_MAC_RE = re.compile(r"^(?:[0-9A-Fa-f]{2}[:-]){5}[0-9A-Fa-f]{2}$")
+
+# Parsed systems configs keyed by absolute path, stored alongside the file's mtime
+_systems_config_cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+# One broadcast socket shared by every send, opened on first use. sendto on a UDP socket
+# is safe across threads, so only the creation needs the lock.
+_wol_socket: Optional[socket.socket] = None
+_wol_socket_lock = threading.Lock()
 
 
 def is_valid_mac(mac: str) -> bool:
     """
     Validates a MAC address in the format XX:XX:XX:XX:XX:XX or XX-XX-XX-XX-XX-XX.
     """
-    return bool(re.match(r"^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$", mac))
+    return _MAC_RE.match(mac) is not None
 
 
-def load_systems_config(config_path: str = CONFIG_PATH) -> Dict[str, Any]:
+def load_systems_config(config_path: Union[str, Path] = CONFIG_PATH) -> Dict[str, Any]:
     """
     Loads a systems configuration from a JSON file.
     
     Attempts to read and parse the specified file as JSON. If the file does not exist or contains invalid JSON, logs an error and returns an empty dictionary.
+    The parsed result is cached and reused until the file's modification time changes; the
+    same dict is shared by every caller, so it must be treated as read-only.
     
     Args:
         config_path: Path to the JSON configuration file.
@@ -36,19 +50,74 @@ def load_systems_config(config_path: str = CONFIG_PATH) -> Dict[str, Any]:
         A dictionary representing the systems configuration, or an empty dictionary on error.
     """
     try:
-        with open(config_path, "r") as file:
-            systems = json.load(file)
+        cache_key = os.path.abspath(config_path)
+        mtime = os.stat(config_path).st_mtime_ns
+        cached = _systems_config_cache.get(cache_key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        # orjson parses the raw bytes directly, skipping the text decode
+        with open(config_path, "rb") as file:
+            systems = orjson.loads(file.read())
+        _systems_config_cache[cache_key] = (mtime, systems)
         return systems
     except FileNotFoundError:
         logging.error(f"Configuration file not found at path: {config_path}")
         speak(f"Configuration file not found at path: {config_path}")
         return {}
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         logging.error(f"Invalid JSON format in configuration file: {config_path}")
         speak(f"Invalid JSON format in configuration file: {config_path}")
         return {}
 
 
+def clear_systems_config_cache() -> None:
+    """
+    Drops every cached systems config, so the next load re-reads the file even if
+    it was rewritten within the filesystem's mtime resolution.
+    """
+    _systems_config_cache.clear()
+
+
+@functools.lru_cache(maxsize=256)
+def _build_magic_packet(mac_hex: str) -> bytes:
+    """
+    Builds the magic packet for a MAC address given as 12 hex digits, cached per address.
+    """
+    return b"\xff" * 6 + bytes.fromhex(mac_hex) * 16
+
+
+def build_magic_packet(mac_address: str) -> bytes:
+    """
+    Builds the 102-byte Wake-on-LAN magic packet for an already validated MAC address.
+    Colon and dash separated forms of the same address share one cached packet.
+    """
+    return _build_magic_packet(mac_address.replace(":", "").replace("-", "").lower())
+
+
+def _get_wol_socket() -> socket.socket:
+    """
+    Returns the shared broadcast UDP socket, creating it on first use.
+    """
+    global _wol_socket
+    with _wol_socket_lock:
+        if _wol_socket is None:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+            _wol_socket = sock
+        return _wol_socket
+
+
+def _reset_wol_socket() -> None:
+    """
+    Closes the shared socket after a send error so the next send starts with a fresh one.
+    """
+    global _wol_socket
+    with _wol_socket_lock:
+        if _wol_socket is not None:
+            _wol_socket.close()
+            _wol_socket = None
+
+
 def send_wol_packet(mac_address: str, tts: bool = True) -> bool:
     """
     Sends a Wake-on-LAN magic packet to the specified MAC address.
@@ -62,28 +131,55 @@ def send_wol_packet(mac_address: str, tts: bool = True) -> bool:
             speak("The MAC address format is invalid. Please provide a valid MAC address.")
         return False
     try:
-        mac_bytes = bytes.fromhex(mac_address.replace(":", "").replace("-", ""))
-        magic_packet = b"\xff" * 6 + mac_bytes * 16
-        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
-            sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-            sock.sendto(magic_packet, ("255.255.255.255", 9))
+        _get_wol_socket().sendto(build_magic_packet(mac_address), WOL_BROADCAST_ADDRESS)
         logging.info(f"WOL packet sent to {mac_address}")
         if tts:
             speak(f"Wake on LAN packet sent to {mac_address}.")
         return True
     except Exception as e:
         logging.error(f"Failed to send WOL packet to {mac_address}: {e}", exc_info=True)
+        _reset_wol_socket()
         if tts:
             speak(f"Failed to send Wake on LAN packet to {mac_address}.")
         return False
 
 
+def send_wol_packets_batch(mac_addresses: List[str], repeat: int = 10) -> Dict[str, bool]:
+    """
+    Sends Wake-on-LAN magic packets to several MAC addresses over the shared broadcast socket.
+    Each packet is sent `repeat` times, since broadcast UDP delivery is not guaranteed.
+    Returns a dict mapping each MAC address to whether its packets were sent. No TTS feedback.
+    """
+    results = {mac: False for mac in mac_addresses}
+    packets = {}
+    for mac in mac_addresses:
+        if not is_valid_mac(mac):
+            logging.error(f"Invalid MAC address format: {mac}")
+            continue
+        packets[mac] = build_magic_packet(mac)
+    if not packets:
+        return results
+    try:
+        sock = _get_wol_socket()
+        for _ in range(repeat):
+            for magic_packet in packets.values():
+                sock.sendto(magic_packet, WOL_BROADCAST_ADDRESS)
+        for mac in packets:
+            results[mac] = True
+        logging.info(f"WOL packets sent to {', '.join(packets)}")
+    except Exception as e:
+        logging.error(f"Failed to send batched WOL packets: {e}", exc_info=True)
+        _reset_wol_socket()
+    return results
+
+
 def wake_on_lan(device_name: str) -> None:
     """
     Looks up a device by name and sends a Wake-on-LAN magic packet to its MAC address, with spoken feedback.
     Args:
         device_name: The name of the device as defined in the config.
     """
+    from modules.device_manager import get_device  # Imported here: device_manager imports CONFIG_PATH from this module
     device = get_device(device_name)
     if not device or "mac_address" not in device:
         speak(f"MAC address for {device_name} not found in configuration.")
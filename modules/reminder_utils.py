@@ -1,7 +1,12 @@
 import re
 from datetime import datetime, timedelta, date
 
+# Upper bound on the text fed to the regex chain; spoken commands are far shorter,
+# so anything beyond this is truncated to keep worst-case matching time bounded.
+MAX_PARSE_TEXT_LENGTH = 512
+
 def parse_reminder(text: str) -> dict | None:
+    text = text[:MAX_PARSE_TEXT_LENGTH]
     task_match = re.search(r"remind me to (.*?)(?=(?:on|at|in|tomorrow|today|next|this|last)\b|$)", text, re.IGNORECASE)
     if not task_match:
         return None
@@ -66,7 +71,7 @@ def parse_reminder(text: str) -> dict | None:
     return None
 
 def parse_list_reminder_request(text: str) -> date | None:
-    text = text.lower()
+    text = text.lower()[:MAX_PARSE_TEXT_LENGTH]
     now = datetime.now()
 
     if "today" in text:
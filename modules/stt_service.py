@@ -1,76 +1,140 @@
 import asyncio
+import gc
+import threading
 import numpy as np
+import torch
 import whisperx
-from .config import ASR_DEVICE, ALIGN_LANGUAGE_CODE, STT_MODEL_NAME, STT_COMPUTE_TYPE, STT_BATCH_SIZE
+from .config import (
+    ASR_DEVICE, ALIGN_DEVICE, STT_CUDA_DEVICE, ALIGN_LANGUAGE_CODE,
+    STT_MODEL_NAME, STT_COMPUTE_TYPE, STT_BATCH_SIZE,
+    AUDIO_SAMPLE_RATE, AUDIO_DURATION_SECONDS, STT_HUSH_THRESHOLD, STT_MIN_SILENCE_MS, STT_WORD_TIMESTAMPS,
+)
 
 stt_model_global = None
 align_model_global = None
 align_metadata_global = None
 
-def initialize_stt():
+# Scale for mapping int16 PCM samples into [-1.0, 1.0)
+_INT16_TO_FLOAT32_SCALE = np.float32(1.0 / 32768.0)
+
+# Recordings are a fixed length, so one float32 buffer sized for them is reused every turn
+# instead of allocating a new array per call. _scratch_lock must be held while a view of it is alive.
+_scratch_buffer = np.empty(AUDIO_DURATION_SECONDS * AUDIO_SAMPLE_RATE, dtype=np.float32)
+_scratch_lock = threading.Lock()
+
+def _int16_to_float32(audio_data_np_int16: np.ndarray) -> np.ndarray:
+    # Single fused cast+scale pass instead of astype() followed by a separate division
+    n_samples = audio_data_np_int16.shape[0]
+    if audio_data_np_int16.ndim == 1 and n_samples <= _scratch_buffer.shape[0]:
+        audio_float32 = _scratch_buffer[:n_samples]
+    else:
+        audio_float32 = np.empty(audio_data_np_int16.shape, dtype=np.float32)
+    np.multiply(audio_data_np_int16, _INT16_TO_FLOAT32_SCALE, out=audio_float32, casting="unsafe")
+    return audio_float32
+
+_SILENCE_FRAME_SAMPLES = AUDIO_SAMPLE_RATE * 20 // 1000  # 20 ms analysis frames
+_MIN_SILENCE_SAMPLES = AUDIO_SAMPLE_RATE * STT_MIN_SILENCE_MS // 1000
+
+def _trim_trailing_silence(audio_float32: np.ndarray) -> np.ndarray:
+    # Cut everything after the last voiced frame (plus a short tail) so the fixed-length
+    # recording window doesn't make the model process seconds of trailing silence.
+    n_frames = audio_float32.shape[0] // _SILENCE_FRAME_SAMPLES
+    if n_frames == 0:
+        return audio_float32
+    frames = audio_float32[:n_frames * _SILENCE_FRAME_SAMPLES].reshape(n_frames, _SILENCE_FRAME_SAMPLES)
+    rms = np.sqrt(np.mean(np.square(frames), axis=1))
+    voiced = np.flatnonzero(rms >= STT_HUSH_THRESHOLD)
+    if voiced.size == 0:
+        return audio_float32  # Nothing above threshold; leave it to WhisperX's VAD
+    end = min((voiced[-1] + 1) * _SILENCE_FRAME_SAMPLES + _MIN_SILENCE_SAMPLES, audio_float32.shape[0])
+    return audio_float32[:end]
+
+def initialize_stt(model_name: str = STT_MODEL_NAME):
     global stt_model_global, align_model_global, align_metadata_global
     print("Initializing STT service...")
+    compute_type = STT_COMPUTE_TYPE
+    if compute_type == "float32":
+        compute_type = "int8_float16" if ASR_DEVICE == "cuda" else "int8"
+        print(f"Warning: STT compute type 'float32' is bandwidth-bound; using '{compute_type}' instead.")
     stt_model_global = whisperx.load_model(
-        STT_MODEL_NAME, device=ASR_DEVICE, compute_type=STT_COMPUTE_TYPE
+        model_name, device=ASR_DEVICE, device_index=STT_CUDA_DEVICE, compute_type=compute_type
     )
+    align_model_global, align_metadata_global = None, None
+    if STT_WORD_TIMESTAMPS:
+        try:
+            align_model_global, align_metadata_global = whisperx.load_align_model(
+                language_code=ALIGN_LANGUAGE_CODE, device=ALIGN_DEVICE
+            )
+            print(f"Alignment model for '{ALIGN_LANGUAGE_CODE}' loaded.")
+        except Exception as e:
+            print(f"Warning: Failed to load alignment model for '{ALIGN_LANGUAGE_CODE}': {e}. Alignment will be skipped.")
+    _warm_up_stt()
+    print("STT service initialized.")
+
+def _warm_up_stt():
+    # Run one dummy inference so the first real request doesn't pay allocator/kernel setup.
+    # WhisperX's VAD drops pure silence before the model runs, so warm the underlying
+    # faster-whisper model directly to exercise both encoder and decoder.
     try:
-        align_model_global, align_metadata_global = whisperx.load_align_model(
-            language_code=ALIGN_LANGUAGE_CODE, device=ASR_DEVICE
-        )
-        print(f"Alignment model for '{ALIGN_LANGUAGE_CODE}' loaded.")
+        silence = np.zeros(AUDIO_SAMPLE_RATE, dtype=np.float32)
+        segments, _ = stt_model_global.model.transcribe(silence, beam_size=1)
+        list(segments)
+        print("STT warm-up complete.")
     except Exception as e:
-        print(f"Warning: Failed to load alignment model for '{ALIGN_LANGUAGE_CODE}': {e}. Alignment will be skipped.")
-        align_model_global, align_metadata_global = None, None
-    print("STT service initialized.")
+        print(f"Warning: STT warm-up failed: {e}. The first transcription may be slower.")
 
-async def transcribe_audio_async(audio_data_np_int16: np.ndarray) -> str:
-    if stt_model_global is None:
-        raise RuntimeError("STT service not initialized. Call initialize_stt() first.")
+def unload_stt():
+    # Drop the models and hand their cached GPU memory back to the driver, so a long-running
+    # assistant can switch model sizes (unload_stt() then initialize_stt(name)) without OOM.
+    global stt_model_global, align_model_global, align_metadata_global
+    with _scratch_lock:  # Wait for any in-flight transcription to finish first
+        stt_model_global = None
+        align_model_global, align_metadata_global = None, None
+    gc.collect()
+    if torch.cuda.is_available():
+        torch.cuda.empty_cache()
+    print("STT service unloaded.")
 
-    audio_float32 = audio_data_np_int16.astype(np.float32) / 32768.0
-    transcribe_result = await asyncio.to_thread(stt_model_global.transcribe, audio_float32, batch_size=STT_BATCH_SIZE)
+def _align(segments, audio_float32: np.ndarray, language_code: str):
+    # fp16 autocast on CUDA halves activation bandwidth in the wav2vec2 forward pass while
+    # weights and inputs stay fp32, so whisperx.align itself needs no changes.
+    # Autocast state is thread-local, so this must run on the thread doing the alignment.
+    with torch.autocast("cuda", dtype=torch.float16, enabled=ALIGN_DEVICE.startswith("cuda")):
+        return whisperx.align(segments, align_model_global, align_metadata_global, audio_float32, ALIGN_DEVICE, language_code)
 
-    if not transcribe_result or not transcribe_result.get("segments"):
-        return ""
+def _transcribe_segments(audio_data_np_int16: np.ndarray) -> list:
+    # Holds the scratch lock for as long as the float32 view is in use (model and alignment)
+    with _scratch_lock:
+        # Re-checked under the lock: a concurrent unload_stt() may have run since the caller's check
+        if stt_model_global is None:
+            raise RuntimeError("STT service not initialized. Call initialize_stt() first.")
+        audio_float32 = _trim_trailing_silence(_int16_to_float32(audio_data_np_int16))
+        result = stt_model_global.transcribe(audio_float32, batch_size=STT_BATCH_SIZE)
+        if not result or not result.get("segments"):
+            return []
+        # Alignment output is discarded by the callers, so only run it when word timestamps are wanted
+        if STT_WORD_TIMESTAMPS:
+            if align_model_global and align_metadata_global:
+                current_lang_code = result["language"]
+                if current_lang_code == ALIGN_LANGUAGE_CODE:
+                    _align(result["segments"], audio_float32, current_lang_code)
+                else:
+                    print(f"Warning: Transcription language '{current_lang_code}' differs from alignment model '{ALIGN_LANGUAGE_CODE}'. Skipping.")
+            else:
+                print("Warning: Alignment model/metadata not loaded. Skipping alignment.")
+        return result["segments"]
 
-    if align_model_global and align_metadata_global:
-        current_lang_code = transcribe_result["language"]
-        if current_lang_code == ALIGN_LANGUAGE_CODE:
-            await asyncio.to_thread(
-                whisperx.align,
-                transcribe_result["segments"],
-                align_model_global,
-                align_metadata_global,
-                audio_float32,
-                ASR_DEVICE,
-                current_lang_code
-            )
-        else:
-            print(
-                f"Warning (Async STT): Transcription language '{current_lang_code}' does not match "
-                f"loaded alignment model language '{ALIGN_LANGUAGE_CODE}'. Skipping alignment."
-            )
-    else:
-        print("Warning: Alignment model or metadata not available. Skipping alignment in async STT.")
+def _join_segment_texts(segments: list) -> str:
+    texts = [segment.get("text", "").strip() for segment in segments]
+    return " ".join(filter(None, texts))
 
-    texts = [segment.get("text", "").strip() for segment in transcribe_result["segments"]]
-    transcription = " ".join(filter(None, texts))
-    return transcription
+async def transcribe_audio_async(audio_data_np_int16: np.ndarray) -> str:
+    if stt_model_global is None:
+        raise RuntimeError("STT service not initialized. Call initialize_stt() first.")
+    segments = await asyncio.to_thread(_transcribe_segments, audio_data_np_int16)
+    return _join_segment_texts(segments)
 
 def transcribe_audio(audio_data_np_int16: np.ndarray) -> str:
     if stt_model_global is None:
         raise RuntimeError("STT service not initialized. Call initialize_stt() first.")
-    audio_float32 = audio_data_np_int16.astype(np.float32) / 32768.0
-    result = stt_model_global.transcribe(audio_float32, batch_size=STT_BATCH_SIZE)
-    if not result or not result.get("segments"):
-        return ""
-    if align_model_global and align_metadata_global:
-        current_lang_code = result["language"]
-        if current_lang_code == ALIGN_LANGUAGE_CODE:
-            whisperx.align(result["segments"], align_model_global, align_metadata_global, audio_float32, ASR_DEVICE, current_lang_code)
-        else:
-            print(f"Warning: Transcription language '{current_lang_code}' differs from alignment model '{ALIGN_LANGUAGE_CODE}'. Skipping.")
-    else:
-        print("Warning: Alignment model/metadata not loaded. Skipping alignment.")
-    texts = [segment.get("text", "").strip() for segment in result["segments"]]
-    return " ".join(filter(None, texts))
\ No newline at end of file
+    return _join_segment_texts(_transcribe_segments(audio_data_np_int16))
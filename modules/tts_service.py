@@ -1,38 +1,238 @@
 import asyncio
+import functools
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import sounddevice as sd
 import torch
 from TTS.api import TTS as CoquiTTS
-from .config import TTS_MODEL_NAME, TTS_SAMPLERATE
+from .config import (
+    TTS_MODEL_NAME,
+    TTS_SAMPLERATE,
+    TTS_DEVICE,
+    TTS_CACHE_SIZE,
+    TTS_CACHE_MAX_CHARS,
+    TTS_USE_ONNX,
+    TTS_ONNX_PATH,
+    TTS_COMPILE,
+    TTS_DTYPE,
+    TTS_SCRIPT_VOCODER,
+    TTS_VOCODER_SCRIPT_PATH,
+)
 
 tts_instance = None
+onnx_model = None  # VITS model with an ONNX Runtime session attached, when TTS_USE_ONNX is set
+# Long-lived playback stream; opening a PortAudio stream per utterance costs noticeable setup latency
+output_stream = None
+playback_samplerate = TTS_SAMPLERATE  # Replaced by the loaded model's output rate in initialize_tts
+# Serializes model loading so concurrent first callers don't each load the weights
+_init_lock = threading.Lock()
+_tts_ready = False  # Set only once loading has fully finished, so unlocked readers never see a partial setup
+# output_stream is shared by every utterance, so one utterance (all its writes plus the drain wait)
+# plays at a time. Async callers queue on _async_playback_lock first so only one of them polls the thread lock.
+_playback_lock = threading.Lock()
+_async_playback_lock = asyncio.Lock()
+
+_AUTOCAST_DTYPES = {"float16": torch.float16, "bfloat16": torch.bfloat16}
+_AUTOCAST_DTYPE = _AUTOCAST_DTYPES.get(TTS_DTYPE)
+_AUTOCAST_ENABLED = _AUTOCAST_DTYPE is not None and TTS_DEVICE.startswith("cuda")
+
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+
+def _split_sentences(text: str) -> list[str]:
+    return [sentence for sentence in _SENTENCE_SPLIT_RE.split(text.strip()) if sentence]
+
+def _synthesize_uncached(text: str) -> np.ndarray:
+    if onnx_model is not None:
+        token_ids = np.asarray(onnx_model.tokenizer.text_to_ids(text), dtype=np.int64)[None, :]
+        return np.asarray(onnx_model.inference_onnx(token_ids), dtype=np.float32).reshape(-1)
+    # inference_mode and autocast are thread-local, so they have to be entered here on the
+    # synthesizing thread. Weights stay fp32; autocast only runs matmuls/convs in half precision.
+    with torch.inference_mode(), torch.autocast("cuda", dtype=_AUTOCAST_DTYPE, enabled=_AUTOCAST_ENABLED):
+        return np.asarray(tts_instance.tts(text=text), dtype=np.float32)
+
+@functools.lru_cache(maxsize=TTS_CACHE_SIZE)
+def _synthesize_cached(text: str) -> np.ndarray:
+    audio = _synthesize_uncached(text)
+    audio.setflags(write=False)  # Shared between callers, so keep it immutable
+    return audio
+
+def _synthesize(text: str) -> np.ndarray:
+    # Greetings, prompts and error messages repeat verbatim, so skip the forward pass for them
+    if len(text) <= TTS_CACHE_MAX_CHARS:
+        return _synthesize_cached(text)
+    return _synthesize_uncached(text)
+
+def _load_onnx_model():
+    """Exports the VITS model to ONNX on first use and attaches an ONNX Runtime session to it."""
+    tts_model = tts_instance.synthesizer.tts_model
+    if not hasattr(tts_model, "export_onnx"):
+        print("Warning: ONNX export is only supported for VITS models. Using PyTorch TTS.")
+        return None
+    use_cuda = TTS_DEVICE.startswith("cuda")
+    try:
+        if not os.path.exists(TTS_ONNX_PATH):
+            print(f"Exporting TTS model to ONNX at {TTS_ONNX_PATH}...")
+            # The exporter traces with CPU dummy inputs, so the weights have to be on the CPU too
+            tts_model.cpu()
+            try:
+                tts_model.export_onnx(output_path=TTS_ONNX_PATH, verbose=False)
+            finally:
+                tts_model.to(TTS_DEVICE)  # Also restored on failure, for the PyTorch fallback
+        onnx_path = TTS_ONNX_PATH
+        if not use_cuda:
+            # Dynamic int8 kernels only exist on the CPU execution provider
+            onnx_path = TTS_ONNX_PATH.replace(".onnx", ".int8.onnx")
+            if not os.path.exists(onnx_path):
+                from onnxruntime.quantization import QuantType, quantize_dynamic
+                quantize_dynamic(TTS_ONNX_PATH, onnx_path, weight_type=QuantType.QInt8)
+        tts_model.load_onnx(onnx_path, cuda=use_cuda)
+        print(f"TTS serving through ONNX Runtime ({onnx_path}).")
+        return tts_model
+    except Exception as e:
+        print(f"Warning: ONNX TTS setup failed: {e}. Using PyTorch TTS.")
+        return None
+
+def _compile_waveform_decoder():
+    tts_model = tts_instance.synthesizer.tts_model
+    if not hasattr(tts_model, "waveform_decoder"):
+        print("Warning: TTS_COMPILE is only supported for VITS models. Skipping torch.compile.")
+        return
+    try:
+        # Utterance lengths vary every call, so compile for dynamic shapes rather than
+        # "reduce-overhead", whose CUDA graphs would be re-recorded for each new length.
+        tts_model.waveform_decoder = torch.compile(tts_model.waveform_decoder, dynamic=True)
+        print("TTS waveform decoder compiled; compilation finishes during warm-up.")
+    except Exception as e:
+        print(f"Warning: torch.compile failed for the TTS decoder: {e}. Running it eagerly.")
+
+class _ScriptedDecoder(torch.nn.Module):
+    """Adapts a traced single-speaker waveform decoder to the decoder(x, g=None) call used by VITS."""
+
+    def __init__(self, scripted):
+        super().__init__()
+        self.scripted = scripted
+
+    def forward(self, x, g=None):
+        return self.scripted(x)
+
+def _script_waveform_decoder():
+    tts_model = tts_instance.synthesizer.tts_model
+    if not hasattr(tts_model, "waveform_decoder") or getattr(tts_model, "embedded_speaker_dim", 0):
+        print("Warning: TTS_SCRIPT_VOCODER is only supported for single-speaker VITS models. Skipping.")
+        return
+    try:
+        if os.path.exists(TTS_VOCODER_SCRIPT_PATH):
+            scripted = torch.jit.load(TTS_VOCODER_SCRIPT_PATH, map_location="cpu")
+        else:
+            print(f"Tracing TTS waveform decoder to {TTS_VOCODER_SCRIPT_PATH}...")
+            # The decoder is fully convolutional, so one trace serves every input length
+            example = torch.randn(1, tts_model.args.hidden_channels, 64)
+            with torch.no_grad():
+                traced = torch.jit.trace(tts_model.waveform_decoder.eval(), example)
+            scripted = torch.jit.optimize_for_inference(traced)
+            torch.jit.save(scripted, TTS_VOCODER_SCRIPT_PATH)
+        tts_model.waveform_decoder = _ScriptedDecoder(scripted)
+        print("TTS waveform decoder running as TorchScript.")
+    except Exception as e:
+        print(f"Warning: TorchScript export of the TTS decoder failed: {e}. Running it eagerly.")
+
+def _open_output_stream():
+    stream = sd.OutputStream(samplerate=playback_samplerate, channels=1, dtype="float32")
+    stream.start()
+    return stream
 
 def initialize_tts():
-    global tts_instance
+    # Idempotent: the first caller loads the model, later or concurrent callers reuse it
+    with _init_lock:
+        if not _tts_ready:
+            _load_tts()
+
+def _load_tts():
+    global tts_instance, onnx_model, output_stream, playback_samplerate, _tts_ready
     print("Initializing TTS service...")
+    _synthesize_cached.cache_clear()
+    # Every sentence has a different length, so cuDNN autotuning would re-benchmark on almost every call
+    torch.backends.cudnn.benchmark = False
     try:
         tts_instance = CoquiTTS(
             model_name=TTS_MODEL_NAME,
             progress_bar=True,
-            gpu=torch.cuda.is_available(),
-        )
+        ).to(TTS_DEVICE)
         print("TTS service initialized.")
     except Exception as e:
         print(f"Failed to initialize Coqui TTS: {e}")
         raise
+    # Resolved once here so playback never needs to inspect the synthesizer per utterance
+    playback_samplerate = getattr(tts_instance.synthesizer, "output_sample_rate", None) or TTS_SAMPLERATE
+    if output_stream is not None and output_stream.samplerate != playback_samplerate:
+        output_stream.close()
+        output_stream = None
+    onnx_model = _load_onnx_model() if TTS_USE_ONNX else None
+    if onnx_model is None:
+        if TTS_COMPILE:
+            _compile_waveform_decoder()
+        elif TTS_SCRIPT_VOCODER and TTS_DEVICE == "cpu":
+            _script_waveform_decoder()
+    if output_stream is None:
+        output_stream = _open_output_stream()
+    # Synthesize a throwaway phrase so the first spoken response doesn't pay warm-up cost
+    try:
+        _synthesize_uncached("Hello.")
+        print("TTS warm-up complete.")
+    except Exception as e:
+        print(f"Warning: TTS warm-up failed: {e}. The first response may be slower.")
+    _tts_ready = True
+
+async def _acquire_playback_lock():
+    # Polled rather than acquired in a worker thread, so a cancelled caller can never leave it held
+    while not _playback_lock.acquire(blocking=False):
+        await asyncio.sleep(0.02)
 
 async def text_to_speech_async(text: str):
-    if tts_instance is None:
-        raise RuntimeError("TTS service not initialized. Call initialize_tts() first.")
+    if not _tts_ready:
+        await asyncio.to_thread(initialize_tts)
     try:
-        audio_output = await asyncio.to_thread(tts_instance.tts, text=text)
-        await asyncio.to_thread(sd.play, audio_output, samplerate=TTS_SAMPLERATE)
-        await asyncio.to_thread(sd.wait)
+        sentences = _split_sentences(text)
+        if not sentences:
+            return
+        async with _async_playback_lock:
+            await _acquire_playback_lock()
+            try:
+                # Synthesize sentence by sentence so playback starts after the first one is ready,
+                # and synthesize each following sentence while the previous one is playing.
+                stream = output_stream
+                audio = await asyncio.to_thread(_synthesize, sentences[0])
+                for next_sentence in sentences[1:]:
+                    _, audio = await asyncio.gather(
+                        asyncio.to_thread(stream.write, audio.reshape(-1, 1)),
+                        asyncio.to_thread(_synthesize, next_sentence),
+                    )
+                await asyncio.to_thread(stream.write, audio.reshape(-1, 1))
+                # write() returns once the audio is buffered; wait for it to play so the caller's
+                # next recording doesn't pick up the end of our own speech
+                await asyncio.sleep(stream.latency)
+            finally:
+                _playback_lock.release()
     except Exception as e:
         print(f"Async Coqui TTS error: {e}")
 
 def text_to_speech(text: str): # Keep sync version if used by non-async parts
-    if tts_instance is None:
-        raise RuntimeError("TTS not initialized")
-    audio = tts_instance.tts(text=text)
-    sd.play(audio, samplerate=TTS_SAMPLERATE)
-    sd.wait()
\ No newline at end of file
+    if not _tts_ready:
+        initialize_tts()
+    sentences = _split_sentences(text)
+    if not sentences:
+        return
+    with _playback_lock:
+        stream = output_stream
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = executor.submit(_synthesize, sentences[0])
+            for next_sentence in sentences[1:]:
+                audio = pending.result()
+                pending = executor.submit(_synthesize, next_sentence)
+                stream.write(audio.reshape(-1, 1))
+            stream.write(pending.result().reshape(-1, 1))
+        time.sleep(stream.latency)  # Let the buffered tail finish playing before returning
@@ -1,27 +1,154 @@
-import asyncio # noqa F401
+import asyncio
 import aiohttp
+import orjson
 import os
-from typing import Optional, Tuple, Dict, Union, Any
-from .config import OPENWEATHER_API_KEY_FILE_PATH
+import time
+from dataclasses import asdict, dataclass
+from typing import Optional, Tuple, Dict, Union
+from .config import OPENWEATHER_API_KEY_FILE_PATH, WEATHER_CACHE_PATH
 
 OPENWEATHER_API_URL = "http://api.openweathermap.org/data/2.5/weather"
 IP_GEOLOCATION_URL = "http://ip-api.com/json/"
 api_key = None
 
-def initialize_weather_service():
-    global api_key
-    print("Initializing Weather service...")
+
+@dataclass(frozen=True, slots=True)
+class WeatherResult:
+    description: str
+    temp: float
+    city: str
+
+
+# One session for the app so OpenWeather/ip-api calls reuse pooled keep-alive connections.
+# Created lazily because a ClientSession must be created inside the running event loop.
+_session: Optional[aiohttp.ClientSession] = None
+# Current conditions change slowly, so results are reused for a while per city/coordinates.
+# Timestamps are wall-clock so the cache can be persisted and reused across a quick restart.
+WEATHER_CACHE_TTL = 600  # seconds
+WEATHER_CACHE_MAX_ENTRIES = 512
+_weather_cache: Dict[str, Tuple[float, WeatherResult]] = {}
+# The host's public IP (and so its rough location) rarely changes; keep (lat, lon, expiry)
+IP_GEO_CACHE_TTL = 6 * 3600  # seconds
+_ip_geo_cache: Optional[Tuple[float, float, float]] = None
+_ip_geo_warmup_task: Optional["asyncio.Task"] = None
+# Fetches currently in flight, keyed like _weather_cache, so concurrent identical queries share one request
+_inflight_requests: Dict[str, "asyncio.Task"] = {}
+
+def _read_api_key() -> Optional[str]:
     if os.path.exists(OPENWEATHER_API_KEY_FILE_PATH):
         with open(OPENWEATHER_API_KEY_FILE_PATH, "r") as f:
-            api_key = f.read().strip()
-        if api_key:
+            key = f.read().strip()
+        if key:
             print("Weather service API key loaded.")
-        else:
-            print("Warning: OpenWeather API key file is empty.")
-            api_key = None # Ensure it's None if file was empty
-    else:
-        print(f"Warning: OpenWeather API key file not found at {OPENWEATHER_API_KEY_FILE_PATH}. Weather service will not work.")
-        api_key = None
+            return key
+        print("Warning: OpenWeather API key file is empty.")
+        return None # Ensure it's None if file was empty
+    print(f"Warning: OpenWeather API key file not found at {OPENWEATHER_API_KEY_FILE_PATH}. Weather service will not work.")
+    return None
+
+
+def initialize_weather_service():
+    global api_key, _ip_geo_warmup_task
+    print("Initializing Weather service...")
+    api_key = _read_api_key()
+    _load_weather_cache()  # Results fetched shortly before a restart are still fresh
+    if not api_key:
+        return
+    # Resolve the current location in the background so "weather here" doesn't pay for it later
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    _ip_geo_warmup_task = loop.create_task(get_current_location_coordinates_async())
+
+
+async def reload_api_key_async():
+    """
+    Re-reads the OpenWeather API key at runtime without blocking the event loop.
+    """
+    global api_key
+    api_key = await asyncio.to_thread(_read_api_key)
+
+
+def _get_session() -> aiohttp.ClientSession:
+    global _session
+    if _session is None or _session.closed:
+        # Both hosts are few and stable, so DNS answers are kept for 10 minutes and stale
+        # TLS transports are reaped; the timeout bounds a hung lookup instead of waiting forever.
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=50,
+                limit_per_host=10,
+                use_dns_cache=True,
+                ttl_dns_cache=600,
+                keepalive_timeout=75,
+                enable_cleanup_closed=True,
+            ),
+            timeout=aiohttp.ClientTimeout(total=10, connect=3),
+        )
+    return _session
+
+
+def _weather_cache_key(params: Dict[str, str]) -> str:
+    if "q" in params:
+        return params["q"].strip().lower()
+    return f"{float(params['lat']):.2f},{float(params['lon']):.2f}"
+
+
+def _get_cached_weather(key: str) -> Optional[WeatherResult]:
+    entry = _weather_cache.get(key)
+    if entry and time.time() - entry[0] < WEATHER_CACHE_TTL:
+        return entry[1]  # Frozen, so it is safe to hand the cached instance to every caller
+    return None
+
+
+def _store_cached_weather(key: str, result: WeatherResult) -> None:
+    _weather_cache.pop(key, None)
+    _weather_cache[key] = (time.time(), result)
+    while len(_weather_cache) > WEATHER_CACHE_MAX_ENTRIES:
+        del _weather_cache[next(iter(_weather_cache))]  # Oldest entry first
+
+
+def _load_weather_cache() -> None:
+    try:
+        with open(WEATHER_CACHE_PATH, "rb") as f:
+            entries = orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return
+    # It's a disposable cache, so anything with an unexpected shape (hand-edited, or written
+    # by an older WeatherResult layout) is skipped rather than allowed to block startup
+    if not isinstance(entries, dict):
+        return
+    now = time.time()
+    for key, entry in entries.items():
+        try:
+            timestamp, fields = entry
+            if now - timestamp < WEATHER_CACHE_TTL:
+                _weather_cache[key] = (timestamp, WeatherResult(**fields))
+        except (TypeError, ValueError):
+            continue
+
+
+def _save_weather_cache() -> None:
+    now = time.time()
+    entries = {
+        key: (timestamp, asdict(result))
+        for key, (timestamp, result) in _weather_cache.items()
+        if now - timestamp < WEATHER_CACHE_TTL
+    }
+    try:
+        with open(WEATHER_CACHE_PATH, "wb") as f:
+            f.write(orjson.dumps(entries))
+    except OSError as e:
+        print(f"Warning: Could not save weather cache: {e}")
+
+
+async def close_weather_service():
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    await asyncio.to_thread(_save_weather_cache)
 
 
 async def get_current_location_coordinates_async() -> Optional[Tuple[float, float]]:
@@ -29,22 +156,25 @@ async def get_current_location_coordinates_async() -> Optional[Tuple[float, floa
     Attempts to get current latitude and longitude using IP geolocation.
     Returns (lat, lon) or None if an error occurs.
     """
+    global _ip_geo_cache
+    if _ip_geo_cache and time.monotonic() < _ip_geo_cache[2]:
+        return (_ip_geo_cache[0], _ip_geo_cache[1])
     print("Attempting to get current location via IP geolocation...")
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(IP_GEOLOCATION_URL) as response:
-                response.raise_for_status()
-                data = await response.json()
-                if data.get("status") == "success" and "lat" in data and "lon" in data:
-                    print(
-                        f"IP Geolocation successful: Lat={data['lat']}, Lon={data['lon']}, City={data.get('city', 'N/A')}"
-                    )
-                    return (data["lat"], data["lon"])
-                else:
-                    print(
-                        f"IP Geolocation failed or returned unexpected data: {data.get('message', 'No message')}"
-                    )
-                    return None
+        async with _get_session().get(IP_GEOLOCATION_URL) as response:
+            response.raise_for_status()
+            data = await response.json(loads=orjson.loads)
+            if data.get("status") == "success" and "lat" in data and "lon" in data:
+                print(
+                    f"IP Geolocation successful: Lat={data['lat']}, Lon={data['lon']}, City={data.get('city', 'N/A')}"
+                )
+                _ip_geo_cache = (data["lat"], data["lon"], time.monotonic() + IP_GEO_CACHE_TTL)
+                return (data["lat"], data["lon"])
+            else:
+                print(
+                    f"IP Geolocation failed or returned unexpected data: {data.get('message', 'No message')}"
+                )
+                return None
     except aiohttp.ClientError as e:
         print(f"Error fetching current location via IP: {e}")
     except Exception as e:
@@ -52,9 +182,51 @@ async def get_current_location_coordinates_async() -> Optional[Tuple[float, floa
     return None
 
 
+async def _fetch_weather(
+    params: Dict[str, str],
+    cache_key: str,
+    location_query: Optional[Union[str, Tuple[float, float]]],
+    coordinates_used: Optional[Tuple[float, float]],
+    actual_location_description_for_error: str,
+) -> Optional[WeatherResult]:
+    try:
+        async with _get_session().get(OPENWEATHER_API_URL, params=params) as response:
+            response.raise_for_status() # Raise an exception for HTTP errors
+            data = await response.json(loads=orjson.loads)
+            if data.get("weather") and "main" in data:
+                returned_city_name = data.get("name")
+                final_city_name = (
+                    returned_city_name
+                    if returned_city_name and returned_city_name.strip()
+                    else None
+                )
+
+                if not final_city_name:
+                    if isinstance(location_query, str):
+                        final_city_name = location_query
+                    elif location_query is None and coordinates_used:
+                        final_city_name = f"your current area (around Lat {coordinates_used[0]:.2f}, Lon {coordinates_used[1]:.2f})"
+                    elif isinstance(location_query, tuple) and coordinates_used:
+                        final_city_name = f"area at Lat {coordinates_used[0]:.2f}, Lon {coordinates_used[1]:.2f}"
+                    else:
+                        final_city_name = "the queried location"
+                result = WeatherResult(
+                    description=data["weather"][0]["description"],
+                    temp=data["main"]["temp"],
+                    city=final_city_name,
+                )
+                _store_cached_weather(cache_key, result)
+                return result
+    except aiohttp.ClientError as e:
+        print(f"Error fetching weather for {actual_location_description_for_error}: {e}")
+    except Exception as e:
+        print(f"Unexpected error in get_weather_async for {actual_location_description_for_error}: {e}")
+    return None
+
+
 async def get_weather_async(
     location_query: Optional[Union[str, Tuple[float, float]]] = None,
-) -> Optional[Dict[str, Any]]:
+) -> Optional[WeatherResult]:
     if not api_key:
         print("Error: OpenWeather API key not configured.")
         return None
@@ -92,35 +264,17 @@ async def get_weather_async(
         print(f"Error: Invalid location_query type: {type(location_query)}")
         return None
 
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(OPENWEATHER_API_URL, params=params) as response:
-                response.raise_for_status() # Raise an exception for HTTP errors
-                data = await response.json()
-                if data.get("weather") and "main" in data:
-                    returned_city_name = data.get("name")
-                    final_city_name = (
-                        returned_city_name
-                        if returned_city_name and returned_city_name.strip()
-                        else None
-                    )
-
-                    if not final_city_name:
-                        if isinstance(location_query, str):
-                            final_city_name = location_query
-                        elif location_query is None and coordinates_used:
-                            final_city_name = f"your current area (around Lat {coordinates_used[0]:.2f}, Lon {coordinates_used[1]:.2f})"
-                        elif isinstance(location_query, tuple) and coordinates_used:
-                            final_city_name = f"area at Lat {coordinates_used[0]:.2f}, Lon {coordinates_used[1]:.2f}"
-                        else:
-                            final_city_name = "the queried location"
-                    return {
-                        "description": data["weather"][0]["description"],
-                        "temp": data["main"]["temp"],
-                        "city": final_city_name
-                    }
-    except aiohttp.ClientError as e:
-        print(f"Error fetching weather for {actual_location_description_for_error}: {e}")
-    except Exception as e:
-        print(f"Unexpected error in get_weather_async for {actual_location_description_for_error}: {e}")
-    return None
+    cache_key = _weather_cache_key(params)
+    cached = _get_cached_weather(cache_key)
+    if cached:
+        return cached
+
+    fetch = _inflight_requests.get(cache_key)
+    if fetch is None:
+        fetch = asyncio.ensure_future(
+            _fetch_weather(params, cache_key, location_query, coordinates_used, actual_location_description_for_error)
+        )
+        _inflight_requests[cache_key] = fetch
+        fetch.add_done_callback(lambda _: _inflight_requests.pop(cache_key, None))
+    # Shielded so one caller being cancelled doesn't cancel the fetch other callers are awaiting
+    return await asyncio.shield(fetch)
@@ -3,12 +3,9 @@ def setup_whisperx():
         import whisperx
         try:
             import sounddevice as sd
-            import scipy.io.wavfile as wav
         except ImportError:
-            print("sounddevice and scipy are required. Please install them with: pip install sounddevice scipy")
+            print("sounddevice is required. Please install it with: pip install sounddevice")
             return
-        import tempfile
-        import os
         print("WhisperX setup complete. Models will download on first use.")
         # Prompt user to say something
         duration = 5  # seconds
@@ -16,17 +13,17 @@ def setup_whisperx():
         print("Please say something after the beep...")
         sd.sleep(500)
         print("Beep!")
-        recording = sd.rec(int(duration * fs), samplerate=fs, channels=1, dtype='int16')
+        # Record float32 directly: WhisperX takes a float32 array in [-1, 1], so there is no
+        # int16 conversion pass and no temp WAV round-trip through disk and ffmpeg.
+        recording = sd.rec(int(duration * fs), samplerate=fs, channels=1, dtype='float32')
         sd.wait()
-        # Save to temp wav file
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmpfile:
-            wav.write(tmpfile.name, fs, recording)
-            tmp_wav_path = tmpfile.name
-        # Transcribe with whisperx
-        model = whisperx.load_model("base", device="cpu", compute_type="int8")
-        result = model.transcribe(tmp_wav_path)
+        # Transcribe with whisperx using the runtime's device, precision and batch size
+        from .config import ASR_DEVICE, STT_CUDA_DEVICE, STT_COMPUTE_TYPE, STT_BATCH_SIZE
+        model = whisperx.load_model(
+            "base", device=ASR_DEVICE, device_index=STT_CUDA_DEVICE, compute_type=STT_COMPUTE_TYPE
+        )
+        result = model.transcribe(recording.ravel(), batch_size=STT_BATCH_SIZE)
         # Print the transcription result (print the whole result for clarity)
         print("Transcription result:", result)
-        os.remove(tmp_wav_path)
     except Exception as e:
-        print(f"WhisperX setup or test failed: {e}")
\ No newline at end of file
+        print(f"WhisperX setup or test failed: {e}")
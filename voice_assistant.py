@@ -10,7 +10,7 @@ from modules.config import GREETING_MESSAGE
 from modules.audio_utils import record_audio_async
 from modules.stt_service import initialize_stt, transcribe_audio_async
 from modules.tts_service import initialize_tts, text_to_speech_async
-from modules.weather_service import initialize_weather_service, get_weather_async
+from modules.weather_service import initialize_weather_service, get_weather_async, close_weather_service
 from modules.llm_service import initialize_llm, get_llm_response
 from modules.intent_classifier import initialize_intent_classifier, detect_intent_async
 from modules.reminder_utils import parse_reminder, parse_list_reminder_request
@@ -19,6 +19,29 @@ from modules.gui_utils import show_reminders_gui # type: ignore
 from modules.retrain_utils import trigger_model_retraining_async, parse_retrain_request
 from modules.contractions import normalize_text
 
+# --- Weather query parsing, compiled once instead of rebuilt on every command ---
+# Phrases that indicate current location
+_MY_AREA_PHRASES = frozenset({
+    "my area",
+    "here",
+    "current location",
+    "around me",
+    "local weather",
+})
+_MY_AREA_RE = re.compile("|".join(re.escape(phrase) for phrase in _MY_AREA_PHRASES))
+# Simple queries that imply current location if no specific location is given
+_SIMPLE_WEATHER_QUERIES = frozenset({
+    "what's the weather",
+    "weather today",
+    "weather now",
+    "tell me the weather",
+    "weather",
+})
+_WEATHER_LOCATION_RE = re.compile(
+    r"(?:weather in|weather for|weather at|weather like in)\s+([A-Za-z\s,]+(?:\s+[A-Za-z]+)*)",
+    re.IGNORECASE,
+)
+
 # --- Modularized interaction logic ---
 
 async def process_command(transcription: str):
@@ -66,44 +89,21 @@ async def process_command(transcription: str):
         location_name: Optional[str] = None
         use_current_location = False
 
-        # Define phrases that indicate current location
-        my_area_phrases = [
-            "my area",
-            "here",
-            "current location",
-            "around me",
-            "local weather",
-        ]
-        # Define simple queries that imply current location if no specific location is given
-        simple_weather_queries = [
-            "what's the weather",
-            "weather today",
-            "weather now",
-            "tell me the weather",
-            "weather",
-        ]
-
         # Try to extract a specific location from the transcription
-        location_match = re.search(
-            r"(?:weather in|weather for|weather at|weather like in)\s+([A-Za-z\s,]+(?:\s+[A-Za-z]+)*)",
-            normalized_transcription,
-            re.IGNORECASE,
-        )
+        location_match = _WEATHER_LOCATION_RE.search(normalized_transcription)
 
         if location_match:
             extracted_location = location_match.group(1).strip()
             # Check if the extracted location is actually a "my area" phrase
-            if extracted_location.lower() in [p.lower() for p in my_area_phrases]:
+            if extracted_location.lower() in _MY_AREA_PHRASES:
                 use_current_location = True
             else:
                 location_name = extracted_location
         else:
             # No specific location like "weather in X", check for general "my area" or simple queries
             transcription_lower_stripped = normalized_transcription.lower().strip()
-            is_simple_query = transcription_lower_stripped in simple_weather_queries
-            is_my_area_query = any(
-                phrase in transcription_lower_stripped for phrase in my_area_phrases
-            )
+            is_simple_query = transcription_lower_stripped in _SIMPLE_WEATHER_QUERIES
+            is_my_area_query = _MY_AREA_RE.search(transcription_lower_stripped) is not None
 
             if is_my_area_query or is_simple_query:
                 use_current_location = True
@@ -121,7 +121,7 @@ async def process_command(transcription: str):
                 None
             )  # Pass None to signify current location
             if weather_data:
-                response = f"The current weather in {weather_data['city']} is {weather_data['description']} with a temperature of {weather_data['temp']:.1f} degrees Celsius."
+                response = f"The current weather in {weather_data.city} is {weather_data.description} with a temperature of {weather_data.temp:.1f} degrees Celsius."
 
             else:
                 response = "Sorry, I couldn't determine your current location or fetch the weather for it. Please check your internet connection or try specifying a city."
@@ -129,7 +129,7 @@ async def process_command(transcription: str):
             print(f"Fetching weather for {location_name}...")
             weather_data = await get_weather_async(location_name)
             if weather_data:
-                response = f"The current weather in {weather_data['city']} is {weather_data['description']} with a temperature of {weather_data['temp']:.1f} degrees Celsius."
+                response = f"The current weather in {weather_data.city} is {weather_data.description} with a temperature of {weather_data.temp:.1f} degrees Celsius."
             else:
                 response = f"Sorry, I couldn't fetch the weather for {location_name}. Please ensure the API key is set up and the location is valid."
 
@@ -196,6 +196,7 @@ async def main():
     except KeyboardInterrupt:
         print("Main loop interrupted by user. Exiting.")
     finally:
+        await close_weather_service()
         print("Main loop finished.")
 
 if platform.system() == "Emscripten":